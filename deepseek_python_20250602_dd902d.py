@@ -1,9 +1,10 @@
 import sys
-import random
-import collections
-import itertools
+import json
+import argparse
+import math
+import time
 import pygame
-from pygame.locals import QUIT, MOUSEBUTTONDOWN, KEYDOWN, K_ESCAPE
+from pygame.locals import QUIT, MOUSEBUTTONDOWN, KEYDOWN, K_ESCAPE, K_F3
 # Texas Hold'em Poker Game with Pygame
 
 # Pygame initialization
@@ -53,35 +54,53 @@ PLAYER_POSITIONS = [
     (200, 500)                  # Left
 ]
 
+
+def seat_positions(num_seats):
+    # The six classic seats while they suffice; bigger tables (9-10 handed and
+    # up) are spread round an ellipse, seat 0 still at the bottom for the human
+    if num_seats <= len(PLAYER_POSITIONS):
+        return PLAYER_POSITIONS[:num_seats]
+    center_x, center_y = SCREEN_WIDTH // 2, 390
+    return [
+        (int(center_x + 480 * math.sin(2 * math.pi * i / num_seats)),
+         int(center_y + 260 * math.cos(2 * math.pi * i / num_seats)))
+        for i in range(num_seats)
+    ]
+
+# Tournament payouts, in percent of the prize pool, for 1st, 2nd, 3rd...
+DEFAULT_PAYOUTS = (50, 30, 20)
+
+# All-in runout equity display: seconds of work per frame, and frames to hold each street
+LIVE_EQUITY_FRAME_BUDGET = 0.015
+LIVE_EQUITY_MIN_FRAMES = 45
+
+# Opponent tendencies bots exploit: raisers this tight get no light calls,
+# bettors who fold to raises this often get raised instead of called
+TIGHT_RAISER_PFR = 0.10
+RAISE_FOLDER_RATE = 0.60
+
+# Flop play by where the made hand ranks among all holdings on that flop
+FLOP_RAISE_PERCENTILE = 0.90
+FLOP_CALL_PERCENTILE = 0.60
+
+# Performance overlay (frame times, draw/flip split, input latency, equity timings)
+HUD_TOGGLE_KEY = K_F3
+
 # Constants (from the original code)
-RANKS_STR = "23456789TJQKA"
-SUITS_STR = "CDHS"  # Clubs, Diamonds, Hearts, Spades
-RANK_MAP = {rank: i for i, rank in enumerate(RANKS_STR)}
-RANK_MAP_REV = {i: rank for rank, i in RANK_MAP.items()}
-
-HIGH_CARD = 0
-ONE_PAIR = 1
-TWO_PAIR = 2
-THREE_OF_A_KIND = 3
-STRAIGHT = 4
-FLUSH = 5
-FULL_HOUSE = 6
-FOUR_OF_A_KIND = 7
-STRAIGHT_FLUSH = 8
-ROYAL_FLUSH = 9
-
-HAND_RANK_NAMES = {
-    ROYAL_FLUSH: "Royal Flush",
-    STRAIGHT_FLUSH: "Straight Flush",
-    FOUR_OF_A_KIND: "Four of a Kind",
-    FULL_HOUSE: "Full House",
-    FLUSH: "Flush",
-    STRAIGHT: "Straight",
-    THREE_OF_A_KIND: "Three of a Kind",
-    TWO_PAIR: "Two Pair",
-    ONE_PAIR: "One Pair",
-    HIGH_CARD: "High Card"
-}
+from poker_core import RANKS_STR, SUITS_STR, RANK_MAP, ONE_PAIR, TWO_PAIR, HAND_RANK_NAMES
+from poker_core import card_ids, key_category
+from hand_evaluator import HandEvaluator
+from flop_db import FlopDatabase, category_percentile
+from omaha import OmahaEquityCalculator, OMAHA_HOLE_CARDS
+from pot_ledger import PotLedger
+from runout_sampler import RunoutSampler
+from icm import icm_equity
+from live_equity import LiveEquity
+from player_stats import StatsTracker
+from table_seats import SeatTracker
+from rng_backends import SeededRandom, secure_random, make_rng
+from frame_stats import FrameStats, HIST_BINS, HIST_BIN_MS
+from equity_grid import EquityGrid, GRID_SIZE, grid_cell, grid_label
 
 # Button class for UI
 class TextInput:
@@ -223,12 +242,13 @@ class Card:
 
 # Deck class remains the same
 class Deck:
-    def __init__(self):
+    def __init__(self, rng=None):
         self.cards = [Card(r, s) for r in RANKS_STR for s in SUITS_STR]
+        self.rng = rng or secure_random()  # CSPRNG unless a simulation passes a seeded one
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def deal(self, num_cards=1):
         if num_cards == 1:
@@ -244,93 +264,6 @@ class Deck:
     def __len__(self):
         return len(self.cards)
 
-# HandEvaluator class remains the same
-class HandEvaluator:
-    def get_best_hand(self, seven_cards):
-        if len(seven_cards) < 5:
-            return (HIGH_CARD, [c.rank for c in sorted(seven_cards, reverse=True)], seven_cards)
-
-        best_rank_tuple = (HIGH_CARD, [-1], [])  # (rank_code, tie_breakers, cards)
-
-        for five_card_combo in itertools.combinations(seven_cards, 5):
-            current_rank_tuple = self._evaluate_5_card_hand(list(five_card_combo))
-            if self._compare_rank_tuples(current_rank_tuple, best_rank_tuple) > 0:
-                best_rank_tuple = current_rank_tuple
-        
-        return best_rank_tuple[0], best_rank_tuple[1], list(best_rank_tuple[2])
-
-    def _compare_rank_tuples(self, rank_tuple1, rank_tuple2):
-        if rank_tuple1[0] != rank_tuple2[0]:
-            return rank_tuple1[0] - rank_tuple2[0]
-        
-        for tb1, tb2 in zip(rank_tuple1[1], rank_tuple2[1]):
-            if tb1 != tb2:
-                return tb1 - tb2
-        return 0
-
-    def _evaluate_5_card_hand(self, hand_cards):  # Expects exactly 5 cards
-        hand_cards.sort(key=lambda c: c.rank, reverse=True)
-        ranks = [card.rank for card in hand_cards]
-        suits = [card.suit for card in hand_cards]
-        
-        rank_counts = collections.Counter(ranks)
-        sorted_rank_counts = sorted(rank_counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
-
-        is_flush = len(set(suits)) == 1
-        
-        is_straight = False
-        unique_sorted_ranks = sorted(list(set(ranks)), reverse=True)
-        if len(unique_sorted_ranks) >= 5:
-            if all(r in unique_sorted_ranks for r in [RANK_MAP['A'], RANK_MAP['2'], RANK_MAP['3'], RANK_MAP['4'], RANK_MAP['5']]):
-                is_straight = True
-                straight_high_rank = RANK_MAP['5']
-            else:
-                for i in range(len(unique_sorted_ranks) - 4):
-                    if unique_sorted_ranks[i] - unique_sorted_ranks[i+4] == 4:
-                        is_straight = True
-                        straight_high_rank = unique_sorted_ranks[i]
-                        break
-        
-        if is_straight and is_flush:
-            if straight_high_rank == RANK_MAP['A']:
-                return (ROYAL_FLUSH, [straight_high_rank], hand_cards)
-            return (STRAIGHT_FLUSH, [straight_high_rank], hand_cards)
-
-        if sorted_rank_counts[0][1] == 4:
-            quad_rank = sorted_rank_counts[0][0]
-            kicker = [r for r in ranks if r != quad_rank][0]
-            return (FOUR_OF_A_KIND, [quad_rank, kicker], hand_cards)
-
-        if sorted_rank_counts[0][1] == 3 and sorted_rank_counts[1][1] == 2:
-            trips_rank = sorted_rank_counts[0][0]
-            pair_rank = sorted_rank_counts[1][0]
-            return (FULL_HOUSE, [trips_rank, pair_rank], hand_cards)
-
-        if is_flush:
-            return (FLUSH, ranks, hand_cards)
-
-        if is_straight:
-            return (STRAIGHT, [straight_high_rank], hand_cards)
-
-        if sorted_rank_counts[0][1] == 3:
-            trips_rank = sorted_rank_counts[0][0]
-            kickers = sorted([r for r in ranks if r != trips_rank], reverse=True)[:2]
-            return (THREE_OF_A_KIND, [trips_rank] + kickers, hand_cards)
-
-        if sorted_rank_counts[0][1] == 2 and sorted_rank_counts[1][1] == 2:
-            high_pair_rank = sorted_rank_counts[0][0]
-            low_pair_rank = sorted_rank_counts[1][0]
-            kicker_ranks = [r for r in ranks if r != high_pair_rank and r != low_pair_rank]
-            kicker = kicker_ranks[0] if kicker_ranks else -1
-            return (TWO_PAIR, [high_pair_rank, low_pair_rank, kicker], hand_cards)
-
-        if sorted_rank_counts[0][1] == 2:
-            pair_rank = sorted_rank_counts[0][0]
-            kickers = sorted([r for r in ranks if r != pair_rank], reverse=True)[:3]
-            return (ONE_PAIR, [pair_rank] + kickers, hand_cards)
-        
-        return (HIGH_CARD, ranks, hand_cards)
-
 # Player class with graphical representation
 class Player:
     def __init__(self, name, chips, is_human=False):
@@ -354,7 +287,7 @@ class Player:
     def __str__(self):
         return f"{self.name} ({self.chips} chips)"
     
-    def draw(self, surface, x, y, is_active=False):
+    def draw(self, surface, x, y, is_active=False, equity=None):
         # Draw player box
         color = PLAYER_ACTIVE_COLOR if is_active else PLAYER_BG_COLOR
         pygame.draw.rect(surface, color, (x, y, 200, 100), border_radius=10)
@@ -382,78 +315,98 @@ class Player:
         if status:
             status_surf = FONT_MEDIUM.render(status, True, (255, 50, 50))
             surface.blit(status_surf, (x + 120, y + 60))
+
+        # Draw all-in runout equity
+        if equity is not None:
+            equity_surf = FONT_MEDIUM.render(f"{equity * 100:.1f}%", True, (255, 215, 0))
+            surface.blit(equity_surf, (x + 190 - equity_surf.get_width(), y + 10))
         
         # Draw cards
         card_x = x + 10
         for card in self.hole_cards:
-            # For opponents, only show face up if human or at showdown
-            if not self.is_human and not self.is_all_in and not self.is_folded:
+            # For opponents, only show face up if human or at showdown (or an all-in runout)
+            if equity is not None and not self.is_folded:
+                card.face_up = True
+            elif not self.is_human and not self.is_all_in and not self.is_folded:
                 card.face_up = False
             card.draw(surface, card_x, y + 80, CARD_WIDTH//2, CARD_HEIGHT//2)
             card_x += CARD_WIDTH//2 + 5
 
 # EquityCalculator class remains the same
 class EquityCalculator:
-    def __init__(self, evaluator):
+    def __init__(self, evaluator, rng=None):
         self.evaluator = evaluator
+        self.rng = rng
+        self.omaha_calculator = OmahaEquityCalculator()
 
     def calculate_equity(self, player_hole_cards, board_cards, num_opponents, num_simulations=1000):
+        if len(player_hole_cards) == OMAHA_HOLE_CARDS:
+            return self.omaha_calculator.calculate_equity(
+                card_ids(player_hole_cards), card_ids(board_cards), num_opponents, num_simulations, self.rng)
+
+        if num_simulations <= 0:
+            return 0.0
+
+        hole_ids = card_ids(player_hole_cards)
+        board_ids = card_ids(board_cards)
+        try:
+            sampler = RunoutSampler(hole_ids + board_ids, num_opponents, 5 - len(board_ids), rng=self.rng)
+        except ValueError:
+            return 0.0
+
+        # One (num_simulations, width) batch: opponents' hole cards, then the board completion
+        batch = sampler.sample_batch(num_simulations)
+        width = sampler.row_width
+        opp_cards = sampler.opponent_cards
+
+        # The known board is reduced once; each trial copies it and adds the runout
+        known_board = self.evaluator.fast_evaluator.board_state(board_ids)
+        trial_board = self.evaluator.fast_evaluator.board_state(board_ids)
+        hole_1, hole_2 = hole_ids
+
         player_wins = 0
         ties = 0
-
-        known_cards = set(player_hole_cards + board_cards)
-
-        for _ in range(num_simulations):
-            sim_deck_cards = [Card(r, s) for r in RANKS_STR for s in SUITS_STR]
-            current_sim_deck = [card for card in sim_deck_cards if card not in known_cards]
-            random.shuffle(current_sim_deck)
-
-            opponent_hands = []
-            possible_to_deal = True
-            for _ in range(num_opponents):
-                if len(current_sim_deck) < 2:
-                    possible_to_deal = False
-                    break
-                opponent_hands.append(current_sim_deck[0:2])
-                current_sim_deck = current_sim_deck[2:]
-            if not possible_to_deal: continue
-
-            remaining_board_needed = 5 - len(board_cards)
-            if len(current_sim_deck) < remaining_board_needed:
-                continue
-            
-            sim_additional_board = current_sim_deck[:remaining_board_needed]
-            sim_full_board = board_cards + sim_additional_board
-
-            player_full_hand = player_hole_cards + sim_full_board
-            player_rank_tuple = self.evaluator.get_best_hand(player_full_hand)
-
-            best_opponent_rank_tuple = (HIGH_CARD, [-1], [])
-            for opp_hole in opponent_hands:
-                opp_full_hand = opp_hole + sim_full_board
-                opp_rank_tuple = self.evaluator.get_best_hand(opp_full_hand)
-                if self.evaluator._compare_rank_tuples(opp_rank_tuple, best_opponent_rank_tuple) > 0:
-                    best_opponent_rank_tuple = opp_rank_tuple
-            
-            comparison = self.evaluator._compare_rank_tuples(player_rank_tuple, best_opponent_rank_tuple)
-            if comparison > 0:
+        for row in range(0, num_simulations * width, width):
+            trial_board.copy_from(known_board)
+            for i in range(row + opp_cards, row + width):
+                trial_board.add(batch[i])
+            player_key = trial_board.evaluate_hole(hole_1, hole_2)
+
+            best_opponent_key = -1
+            for i in range(row, row + opp_cards, 2):
+                opp_key = trial_board.evaluate_hole(batch[i], batch[i + 1])
+                if opp_key > best_opponent_key:
+                    best_opponent_key = opp_key
+
+            if player_key > best_opponent_key:
                 player_wins += 1
-            elif comparison == 0:
+            elif player_key == best_opponent_key:
                 ties += 1
-        
-        return (player_wins + ties / 2) / num_simulations if num_simulations > 0 else 0.0
+
+        return (player_wins + ties / 2) / num_simulations
 
 # Game class with graphical interface
 class TexasHoldemGame:
-    def __init__(self, player_names_chips, small_blind=50, big_blind=75):
+    def __init__(self, player_names_chips, small_blind=50, big_blind=75, payouts=DEFAULT_PAYOUTS,
+                 history_path=None, rng=None, sim_rng=None):
         self.evaluator = HandEvaluator()
-        self.equity_calculator = EquityCalculator(self.evaluator)
+        self.rng = rng or secure_random()  # deals the cards
+        self.sim_rng = sim_rng or SeededRandom()  # equity and ICM simulations
+        self.equity_calculator = EquityCalculator(self.evaluator, self.sim_rng)
+        self.flop_db = FlopDatabase.load()
+        self.equity_grid_calculator = EquityGrid()
         self.players = [Player(name, chips, is_human=(i==0)) for i, (name, chips) in enumerate(player_names_chips)]
         self.small_blind_amount = small_blind
         self.big_blind_amount = big_blind
-        self.deck = Deck()
+        self.payouts = payouts
+        self.history_path = history_path  # showdowns appended as JSON lines for equity_replay.py
+        self.deck = Deck(self.rng)
         self.board = []
         self.pot = 0
+        self.pot_ledger = PotLedger()
+        self.seats = SeatTracker()
+        self.player_stats = StatsTracker()
+        self.board_state = None
         self.current_street_highest_bet = 0
         self.dealer_pos = -1
         self.current_player_idx = 0
@@ -461,12 +414,21 @@ class TexasHoldemGame:
         self.buttons = []
         self.message = ""
         self.equity_display = ""
+        self.equity_grid = None  # 13x13 equities shown as a heatmap, None when hidden
+        self.equity_grid_hero_cell = None
+        self.equity_grid_board_len = 0  # board size the grid was computed for
+        self.live_equity = None  # LiveEquity for an all-in runout, None otherwise
+        self.live_equity_players = []
+        self.runout_street = None  # street the betting closed on in an all-in runout
         self.game_state = "pre_flop"  # Tracks current game phase
         self.showdown_info = []
+        self.show_hud = False
+        self.frame_stats = FrameStats()
         
         # Assign positions to players
+        positions = seat_positions(len(self.players))
         for i, player in enumerate(self.players):
-            player.position = PLAYER_POSITIONS[i % len(PLAYER_POSITIONS)]
+            player.position = positions[i]
         
     def _rotate_dealer(self):
         self.dealer_pos = (self.dealer_pos + 1) % len(self.players)
@@ -489,11 +451,17 @@ class TexasHoldemGame:
         sb_player.chips -= sb_amount
         sb_player.current_bet_in_street = sb_amount
         self.pot += sb_amount
+        self.pot_ledger.add(sb_player, sb_amount)
+        if sb_player.chips == 0:
+            sb_player.is_all_in = True
 
         bb_amount = min(self.big_blind_amount, bb_player.chips)
         bb_player.chips -= bb_amount
         bb_player.current_bet_in_street = bb_amount
         self.pot += bb_amount
+        self.pot_ledger.add(bb_player, bb_amount)
+        if bb_player.chips == 0:
+            bb_player.is_all_in = True
         
         self.current_street_highest_bet = bb_amount
         self.current_player_idx = (bb_player_idx + 1) % len(self.players)
@@ -584,6 +552,16 @@ class TexasHoldemGame:
                 "equity"
             ))
         
+        # Equity grid toggle (whole 13x13 chart on the current board)
+        self.buttons.append(Button(
+            SCREEN_WIDTH - 230,
+            button_y - 50,
+            100,
+            30,
+            "Grid",
+            "grid"
+        ))
+        
         # Create text input for bet amount
         bet_input = TextInput(
             start_x + 4*(button_width + button_spacing),
@@ -598,6 +576,7 @@ class TexasHoldemGame:
                 if event.type == QUIT:
                     pygame.quit()
                     sys.exit()
+                self._handle_hud_key(event)
                 
                 # Handle button hover
                 mouse_pos = pygame.mouse.get_pos()
@@ -605,15 +584,30 @@ class TexasHoldemGame:
                     button.check_hover(mouse_pos)
                     action = button.handle_event(event)
                     if action:
+                        if self.show_hud:
+                            # Timed until the frame that shows the response is presented
+                            self.frame_stats.input_dispatched(time.perf_counter())
                         if action == "raise":
                             input_active = True
                         elif action == "equity":
-                            num_opp = len([p for p in self.players if not p.is_folded and p != player])
+                            num_opp = self.seats.num_in_hand - 1
                             if num_opp > 0:
+                                start = time.perf_counter()
                                 equity_val = self.equity_calculator.calculate_equity(player.hole_cards, self.board, num_opp)
+                                self.frame_stats.record_equity("equity", time.perf_counter() - start)
                                 self.equity_display = f"Equity: {equity_val*100:.2f}%"
                             else:
                                 self.equity_display = "No active opponents"
+                        elif action == "grid":
+                            num_opp = self.seats.num_in_hand - 1
+                            if self._shown_equity_grid() is not None:
+                                self.equity_grid = None
+                            elif num_opp > 0:
+                                start = time.perf_counter()
+                                self.equity_grid = self.equity_grid_calculator.compute(card_ids(self.board), num_opp, rng=self.sim_rng)
+                                self.frame_stats.record_equity("grid", time.perf_counter() - start)
+                                self.equity_grid_hero_cell = grid_cell(*card_ids(player.hole_cards))
+                                self.equity_grid_board_len = len(self.board)
                         elif action == "call":
                             return action, min_bet_to_stay
                         elif action == "allin":
@@ -640,7 +634,7 @@ class TexasHoldemGame:
                                 input_active = False
                         else:
                             input_active = False
-            
+
             # Update bet input cursor blink
             if input_active:
                 bet_input.update()
@@ -658,7 +652,7 @@ class TexasHoldemGame:
                 hint_text = FONT_SMALL.render(f"Min: {min_raise}", True, TEXT_COLOR)
                 screen.blit(hint_text, (start_x + 4*(button_width + button_spacing), button_y - 20))
             
-            pygame.display.flip()
+            self._flip()
             pygame.time.delay(30)
 
     def _get_bot_action(self, player):
@@ -679,13 +673,52 @@ class TexasHoldemGame:
             else:
                 action_type = "fold"
         else:  # Post-flop
-            combined_cards = player.hole_cards + self.board
-            rank_code, _, _ = self.evaluator.get_best_hand(combined_cards)
-
-            if rank_code >= ONE_PAIR:
-                action_type = "raise" if rank_code >= TWO_PAIR else "call"
+            rank_code = key_category(self._current_board_state().evaluate_hole(*card_ids(player.hole_cards)))
+
+            if len(self.board) == 3:
+                # How the made hand ranks among every holding on this flop
+                flop_entry = self.flop_db.lookup(self.board)
+                percentile = category_percentile(flop_entry, rank_code)
+                if percentile >= FLOP_RAISE_PERCENTILE:
+                    action_type = "raise"
+                elif percentile >= FLOP_CALL_PERCENTILE:
+                    action_type = "call"
+                else:
+                    action_type = "fold"
             else:
+                if rank_code >= ONE_PAIR:
+                    action_type = "raise" if rank_code >= TWO_PAIR else "call"
+                else:
+                    action_type = "fold"
+
+                # A pair on the board counts towards one pair/two pair for
+                # everyone, so only bet what the hole cards actually add to it
+                if len({card.rank for card in self.board}) < len(self.board):
+                    if rank_code == ONE_PAIR:
+                        action_type = "fold"
+                    elif rank_code == TWO_PAIR:
+                        action_type = "call"
+
+        # Exploit what the stats say about whoever made the current bet
+        raiser = self.player_stats.last_raiser
+        if action_type == "call" and min_bet_to_stay > 0 and raiser is not None and raiser is not player:
+            raiser_stats = self.player_stats.stats(raiser)
+            if not self.board and raiser_stats.pfr.rate(prior=0.2) < TIGHT_RAISER_PFR:
                 action_type = "fold"
+            elif self.board and raiser_stats.fold_to_raise.rate(prior=0.3) >= RAISE_FOLDER_RATE:
+                action_type = "raise"
+
+        # Calls that risk a big part of the stack need more equity under ICM
+        # than chip EV alone would suggest
+        if action_type != "fold" and min_bet_to_stay * 3 >= player.chips:
+            required_equity = self._icm_required_equity(player, min(min_bet_to_stay, player.chips))
+            if required_equity is not None:
+                num_opp = self.seats.num_in_hand - 1
+                start = time.perf_counter()
+                hand_equity = self.equity_calculator.calculate_equity(player.hole_cards, self.board, num_opp, 300)
+                self.frame_stats.record_equity(f"{player.name} ICM check", time.perf_counter() - start)
+                if hand_equity < required_equity:
+                    action_type = "fold"
 
         # Execute action chosen
         if action_type == "fold":
@@ -716,13 +749,40 @@ class TexasHoldemGame:
 
         return "check" if can_check else "fold", 0
 
+    def icm_equities(self, stacks=None):
+        # Tournament equity (percent of the prize pool) per player under ICM
+        stacks = stacks or [p.chips for p in self.players]
+        return dict(zip(self.players, icm_equity(stacks, self.payouts, rng=self.sim_rng)))
+
+    def _icm_required_equity(self, player, risk):
+        # Win probability at which calling `risk` breaks even in ICM terms,
+        # assuming the pot goes to the aggressor if we fold or lose
+        if self.aggressor is None or self.aggressor is player or risk <= 0:
+            return None
+        me = self.players.index(player)
+        villain = self.players.index(self.aggressor)
+        stacks = [p.chips for p in self.players]
+
+        fold_stacks = list(stacks)
+        fold_stacks[villain] += self.pot
+        lose_stacks = list(fold_stacks)
+        lose_stacks[me] -= risk
+        lose_stacks[villain] += risk
+        win_stacks = list(stacks)
+        win_stacks[me] += self.pot
+
+        fold_eq = self.icm_equities(fold_stacks)[player]
+        lose_eq = self.icm_equities(lose_stacks)[player]
+        win_eq = self.icm_equities(win_stacks)[player]
+        if win_eq <= lose_eq:
+            return None
+        return (fold_eq - lose_eq) / (win_eq - lose_eq)
+
     def _betting_round(self, street_name):
         self.message = f"{street_name} Betting Round"
         self.game_state = street_name.lower().replace("-", "_")
-        
-        num_active_players_in_hand = len([p for p in self.players if not p.is_folded and p.chips > 0])
-        if num_active_players_in_hand <= 1:
-            return
+        self.player_stats.start_street(street_name)
+        seats = self.seats
 
         if street_name != "Pre-flop":
             for p in self.players:
@@ -731,27 +791,16 @@ class TexasHoldemGame:
             self.current_street_highest_bet = 0
             self.current_player_idx = (self.dealer_pos + 1) % len(self.players)
             self.aggressor = None
+        seats.start_street()
 
-        initial_actor_idx = self.current_player_idx
-        while self.players[self.current_player_idx].is_folded or self.players[self.current_player_idx].is_all_in:
-            self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-            if self.current_player_idx == initial_actor_idx:
-                return
+        if self._betting_closed():
+            return
+        self.current_player_idx = seats.next_actor(self.current_player_idx)
 
         actions_this_round = 0
-        players_acted_this_betting_level = set()
-
-        round_over = False
-        while not round_over:
-            num_active_players_in_hand = len([p for p in self.players if not p.is_folded and p.chips > 0])
-            if num_active_players_in_hand <= 1:
-                break
-
-            player = self.players[self.current_player_idx]
-
-            if player.is_folded or player.is_all_in:
-                self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-                continue
+        while True:
+            player_idx = self.current_player_idx
+            player = self.players[player_idx]
 
             if player.is_human:
                 action, amount = self._get_player_action(player)
@@ -760,9 +809,12 @@ class TexasHoldemGame:
 
             player.last_action = action
             self.message = f"{player.name} {action}s"
+            to_call = self.current_street_highest_bet - player.current_bet_in_street
+            highest_bet_before = self.current_street_highest_bet
 
             if action == "fold":
                 player.is_folded = True
+                seats.fold(player_idx)
             elif action == "check":
                 pass
             elif action == "call":
@@ -770,6 +822,7 @@ class TexasHoldemGame:
                 player.chips -= actual_call_amount
                 player.current_bet_in_street += actual_call_amount
                 self.pot += actual_call_amount
+                self.pot_ledger.add(player, actual_call_amount)
                 if player.chips == 0:
                     player.is_all_in = True
             elif action == "raise":
@@ -777,58 +830,88 @@ class TexasHoldemGame:
                 player.chips -= actual_raise_amount
                 player.current_bet_in_street += actual_raise_amount
                 self.pot += actual_raise_amount
+                self.pot_ledger.add(player, actual_raise_amount)
                 self.current_street_highest_bet = player.current_bet_in_street
                 self.aggressor = player
-                players_acted_this_betting_level.clear()
                 if player.chips == 0:
                     player.is_all_in = True
             elif action == "allin":
                 all_in_amount = player.chips
                 player.current_bet_in_street += all_in_amount
                 self.pot += all_in_amount
+                self.pot_ledger.add(player, all_in_amount)
                 player.chips = 0
                 player.is_all_in = True
                 if player.current_bet_in_street > self.current_street_highest_bet:
                     self.current_street_highest_bet = player.current_bet_in_street
                     self.aggressor = player
-                    players_acted_this_betting_level.clear()
 
-            players_acted_this_betting_level.add(self.current_player_idx)
+            raised = self.current_street_highest_bet > highest_bet_before
+            self.player_stats.record_action(player, action, to_call, raised)
+            if player.is_all_in:
+                seats.go_all_in(player_idx)
+            if raised:
+                seats.new_bet_level(player_idx)
+            else:
+                seats.mark_acted(player_idx)
+
+            if self._betting_closed():
+                break
+            self.current_player_idx = seats.next_actor((player_idx + 1) % len(self.players))
 
-            all_eligible_acted = True
-            all_bets_equalized = True
-            
-            for i, p_check in enumerate(self.players):
-                if p_check.is_folded or p_check.is_all_in:
-                    continue
-                if i not in players_acted_this_betting_level:
-                    all_eligible_acted = False
-                    break
-                if p_check.current_bet_in_street < self.current_street_highest_bet:
-                    all_bets_equalized = False
-
-            is_preflop_bb_option = (street_name == "Pre-flop" and
-                                    self.players[self.current_player_idx].current_bet_in_street == self.big_blind_amount and
-                                    self.current_street_highest_bet == self.big_blind_amount and
-                                    self.aggressor == self.players[(self.dealer_pos + 2)%len(self.players)] and
-                                    self.current_player_idx == (self.dealer_pos + 2)%len(self.players) and
-                                    len(players_acted_this_betting_level) >= len([p for p in self.players if not p.is_folded and not p.is_all_in]) -1
-                                   )
-
-            if all_eligible_acted and all_bets_equalized and not is_preflop_bb_option:
-                round_over = True
-            
-            if is_preflop_bb_option and (action == "check" or action == "call"):
-                round_over = True
-            
-            if not round_over:
-                 self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-            
             actions_this_round += 1
             if actions_this_round > len(self.players) * 3:
                 break
 
+    def _betting_closed(self):
+        # O(1) from the seat tracker. Limpers leave the action open for the big
+        # blind, whose blind isn't an action, so the BB option falls out of
+        # "everyone who can act has acted since the last raise".
+        seats = self.seats
+        if seats.num_in_hand <= 1 or seats.num_actors == 0 or seats.level_complete():
+            return True
+        if seats.num_actors == 1:
+            # A lone player who can still bet only acts when facing one
+            lone = self.players[seats.next_actor(0)]
+            return lone.current_bet_in_street >= self.current_street_highest_bet
+        return False
+
+    def _current_board_state(self):
+        # Board reduced once per street and shared by every player's evaluation
+        if self.board_state is None or self.board_state.num_cards != len(self.board):
+            self.board_state = self.evaluator.fast_evaluator.board_state(card_ids(self.board))
+        return self.board_state
+
+    def _is_all_in_runout(self):
+        # Two or more hands still live and at most one of them can still bet
+        return self.seats.num_in_hand >= 2 and self.seats.num_actors <= 1
+
+    def _show_live_equity(self):
+        # TV-style equities for an all-in runout. The computation is sliced
+        # into per-frame budgets so the table keeps rendering while it converges.
+        if self.runout_street is None:
+            self.runout_street = self.game_state
+        self.live_equity_players = [p for p in self.players if not p.is_folded]
+        self.live_equity = LiveEquity([card_ids(p.hole_cards) for p in self.live_equity_players],
+                                      card_ids(self.board), rng=self.sim_rng)
+        frames = 0
+        while frames < LIVE_EQUITY_MIN_FRAMES or not self.live_equity.done:
+            frame_start = time.perf_counter()
+            self.live_equity.step(LIVE_EQUITY_FRAME_BUDGET)
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    pygame.quit()
+                    sys.exit()
+                self._handle_hud_key(event)
+            self.draw()
+            self._flip()
+            elapsed_ms = int((time.perf_counter() - frame_start) * 1000)
+            pygame.time.delay(max(0, 33 - elapsed_ms))
+            frames += 1
+        self.frame_stats.record_equity("live runout", self.live_equity.elapsed)
+
     def _showdown(self):
+        self.player_stats.end_hand()
         self.game_state = "showdown"
         self.message = "Showdown"
         
@@ -842,53 +925,64 @@ class TexasHoldemGame:
             winner.chips += self.pot
             return
 
-        best_hand_tuples = []
+        hand_keys = {}
         self.showdown_info = []
+        board_state = self._current_board_state()
         for player in eligible_players:
             combined_cards = player.hole_cards + self.board
-            rank_code, tie_breakers, best_5_cards = self.evaluator.get_best_hand(combined_cards)
-            best_hand_tuples.append((player, rank_code, tie_breakers, best_5_cards))
+            key = board_state.evaluate_hole(*card_ids(player.hole_cards))
+            best_5_cards = self.evaluator.best_five_cards(combined_cards, key)
+            hand_keys[player] = key
             self.showdown_info.append(
-                f"{player.name}: {HAND_RANK_NAMES[rank_code]} ({[str(c) for c in best_5_cards]})"
+                f"{player.name}: {HAND_RANK_NAMES[key_category(key)]} ({[str(c) for c in best_5_cards]})"
             )
 
-        winners = []
-        best_seen_rank_tuple_for_comparison = (HIGH_CARD, [-1], [])
-
-        for p_tuple in best_hand_tuples:
-            player_obj, rank_c, tb_vals, _ = p_tuple
-            current_eval_tuple = (rank_c, tb_vals, [])
-
-            if not winners:
-                winners = [player_obj]
-                best_seen_rank_tuple_for_comparison = current_eval_tuple
+        # Main and side pots, odd chips going to the first winner left of the button
+        seat_order = {p: (i - self.dealer_pos - 1) % len(self.players) for i, p in enumerate(self.players)}
+        payouts, pots = self.pot_ledger.resolve(hand_keys, seat_order)
+        for winner, amount in payouts.items():
+            winner.chips += amount
+        if self.history_path:
+            self._record_hand(sorted(eligible_players, key=lambda p: seat_order[p]), payouts)
+
+        if payouts:
+            if len(pots) == 1:
+                win_names = ", ".join([w.name for w in pots[0][1]])
+                self.message = f"Winner(s): {win_names}, pot {pots[0][0]}"
             else:
-                comparison_result = self.evaluator._compare_rank_tuples(current_eval_tuple, best_seen_rank_tuple_for_comparison)
-                if comparison_result > 0:
-                    winners = [player_obj]
-                    best_seen_rank_tuple_for_comparison = current_eval_tuple
-                elif comparison_result == 0:
-                    winners.append(player_obj)
-        
-        if winners:
-            pot_per_winner = self.pot / len(winners)
-            win_names = ", ".join([w.name for w in winners])
-            self.message = f"Winner(s): {win_names}, each gets {pot_per_winner:.2f} chips"
-            for winner in winners:
-                winner.chips += pot_per_winner
+                self.message = "; ".join(
+                    f"{'Main pot' if i == 0 else f'Side pot {i}'} {amount}: {', '.join(w.name for w in winners)}"
+                    for i, (amount, winners) in enumerate(pots)
+                )
         else:
             self.message = "Error: No winner determined"
 
+    def _record_hand(self, showdown_players, payouts):
+        record = {
+            "board": "".join(str(c) for c in self.board),
+            "decided": self.runout_street or "river",
+            "players": [{"name": p.name, "hole": "".join(str(c) for c in p.hole_cards)} for p in showdown_players],
+            "contributions": {p.name: amount for p, amount in self.pot_ledger.contributions.items()},
+            "payouts": {p.name: amount for p, amount in payouts.items()},
+        }
+        with open(self.history_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
     def play_hand(self):
         if len([p for p in self.players if p.chips > 0]) < 2:
             self.message = "Not enough players with chips"
             return False
 
-        self.deck = Deck()
+        self.deck = Deck(self.rng)
         self.board = []
+        self.board_state = None
         self.pot = 0
+        self.pot_ledger.reset()
         self.current_street_highest_bet = 0
         self.equity_display = ""
+        self.equity_grid = None
+        self.live_equity = None
+        self.runout_street = None
         self.showdown_info = []
         for p in self.players:
             p.reset_for_hand()
@@ -899,11 +993,15 @@ class TexasHoldemGame:
         if not self._post_blinds():
             return False
         self._deal_hole_cards()
+        self.seats.start_hand(self.players)
+        self.player_stats.start_hand(self.players)
 
         # Pre-flop betting
         self.game_state = "pre_flop"
         self._betting_round("Pre-flop")
-        if len([p for p in self.players if not p.is_folded]) <= 1:
+        if self._is_all_in_runout():
+            self._show_live_equity()
+        if self.seats.num_in_hand <= 1:
             self._showdown()
             return True
 
@@ -912,7 +1010,9 @@ class TexasHoldemGame:
         self.game_state = "flop"
         self.message = "Flop Dealt"
         self._betting_round("Flop")
-        if len([p for p in self.players if not p.is_folded]) <= 1:
+        if self._is_all_in_runout():
+            self._show_live_equity()
+        if self.seats.num_in_hand <= 1:
             self._showdown()
             return True
 
@@ -921,7 +1021,9 @@ class TexasHoldemGame:
         self.game_state = "turn"
         self.message = "Turn Dealt"
         self._betting_round("Turn")
-        if len([p for p in self.players if not p.is_folded]) <= 1:
+        if self._is_all_in_runout():
+            self._show_live_equity()
+        if self.seats.num_in_hand <= 1:
             self._showdown()
             return True
 
@@ -930,6 +1032,8 @@ class TexasHoldemGame:
         self.game_state = "river"
         self.message = "River Dealt"
         self._betting_round("River")
+        if self._is_all_in_runout():
+            self._show_live_equity()
         self._showdown()
         return True
 
@@ -941,13 +1045,14 @@ class TexasHoldemGame:
             # Show results for a few seconds
             for _ in range(150):  # About 5 seconds
                 self.draw()
-                pygame.display.flip()
+                self._flip()
                 pygame.time.delay(33)
                 
                 for event in pygame.event.get():
                     if event.type == QUIT:
                         pygame.quit()
                         sys.exit()
+                    self._handle_hud_key(event)
             
             # Remove players with no chips
             self.players = [p for p in self.players if p.chips > 0]
@@ -957,6 +1062,7 @@ class TexasHoldemGame:
         # Show final results
         self.message = "Game Over"
         self.game_state = "game_over"
+        self.live_equity = None
         while True:
             for event in pygame.event.get():
                 if event.type == QUIT:
@@ -966,12 +1072,88 @@ class TexasHoldemGame:
                     if event.key == K_ESCAPE:
                         pygame.quit()
                         sys.exit()
+                self._handle_hud_key(event)
             
             self.draw()
-            pygame.display.flip()
+            self._flip()
             pygame.time.delay(33)
 
+    def _handle_hud_key(self, event):
+        if event.type == KEYDOWN and event.key == HUD_TOGGLE_KEY:
+            self.show_hud = not self.show_hud
+            self.frame_stats.reset()
+
+    def _flip(self):
+        # Only timed while the HUD is up; otherwise a plain flip
+        if not self.show_hud:
+            pygame.display.flip()
+            return
+        start = time.perf_counter()
+        pygame.display.flip()
+        end = time.perf_counter()
+        self.frame_stats.record_flip(end - start)
+        self.frame_stats.frame_done(end)
+
+    def _draw_hud(self):
+        stats = self.frame_stats
+        lines = [
+            f"FPS: {stats.fps():.1f}  (avg {stats.average_ms():.1f} ms, max {stats.max_ms:.1f} ms)",
+            f"draw {stats.draw_ms:.1f} ms / flip {stats.flip_ms:.1f} ms",
+            "input latency: " + (f"{stats.input_latency_ms:.0f} ms" if stats.input_latency_ms is not None else "-"),
+            "last equity: " + (f"{stats.equity_label} {stats.equity_ms:.0f} ms" if stats.equity_ms is not None else "-"),
+        ]
+        hud_x, hud_y = 20, 50
+        bar_width, bar_height = 14, 40
+        panel = pygame.Surface((300, len(lines) * 20 + bar_height + 30), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        screen.blit(panel, (hud_x - 5, hud_y - 5))
+        for i, line in enumerate(lines):
+            screen.blit(FONT_SMALL.render(line, True, (180, 255, 180)), (hud_x, hud_y + i * 20))
+
+        # Frame-time histogram, one bar per HIST_BIN_MS bucket; slow buckets in red
+        base_y = hud_y + len(lines) * 20 + bar_height + 5
+        peak = max(stats.histogram) or 1
+        for i, count in enumerate(stats.histogram):
+            height = bar_height * count // peak
+            color = (120, 220, 120) if (i + 1) * HIST_BIN_MS <= 34 else (230, 90, 90)
+            pygame.draw.rect(screen, color, (hud_x + i * (bar_width + 2), base_y - height, bar_width, height))
+        label = FONT_SMALL.render(f"0-{HIST_BINS * HIST_BIN_MS}+ ms", True, (180, 255, 180))
+        screen.blit(label, (hud_x + HIST_BINS * (bar_width + 2) + 5, base_y - label.get_height()))
+
+    def _shown_equity_grid(self):
+        # The grid is only valid for the board it was computed on; drop it once a street is dealt
+        if self.equity_grid is not None and self.equity_grid_board_len != len(self.board):
+            self.equity_grid = None
+        return self.equity_grid
+
+    def _draw_equity_grid(self):
+        cell = 24
+        grid_x = SCREEN_WIDTH - GRID_SIZE * cell - 20
+        grid_y = SCREEN_HEIGHT - 170 - GRID_SIZE * cell
+        panel = pygame.Surface((GRID_SIZE * cell + 10, GRID_SIZE * cell + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        screen.blit(panel, (grid_x - 5, grid_y - 5))
+
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                rect = (grid_x + col * cell, grid_y + row * cell, cell - 1, cell - 1)
+                equity = self.equity_grid[row][col]
+                if equity is None:
+                    color = (60, 60, 60)
+                else:
+                    # Red at 0% through yellow at 50% to green at 100%
+                    color = (int(255 * min(1.0, 2 - 2 * equity)), int(255 * min(1.0, 2 * equity)), 40)
+                pygame.draw.rect(screen, color, rect)
+                if (row, col) == self.equity_grid_hero_cell:
+                    pygame.draw.rect(screen, (255, 255, 255), rect, 2)
+                label = grid_label(row, col)[:2]
+                label_surf = FONT_SMALL.render(label, True, (0, 0, 0))
+                screen.blit(label_surf, (rect[0] + cell // 2 - label_surf.get_width() // 2,
+                                         rect[1] + cell // 2 - label_surf.get_height() // 2))
+
     def draw(self):
+        if self.show_hud:
+            draw_start = time.perf_counter()
         # Fill background
         screen.fill(BACKGROUND_COLOR)
         
@@ -999,13 +1181,16 @@ class TexasHoldemGame:
                 card.draw(screen, board_x + i*(CARD_WIDTH + CARD_SPACING), board_y)
         
         # Draw players
+        live_equities = {}
+        if self.live_equity is not None:
+            live_equities = dict(zip(self.live_equity_players, self.live_equity.equities()))
         for i, player in enumerate(self.players):
             x, y = player.position
             is_active = (i == self.current_player_idx and 
                          not player.is_folded and 
                          not player.is_all_in and
                          "game_over" not in self.game_state)
-            player.draw(screen, x - 100, y - 50, is_active)
+            player.draw(screen, x - 100, y - 50, is_active, live_equities.get(player))
             
             # Draw chips in front of player
             chip_x = x - 20
@@ -1025,6 +1210,10 @@ class TexasHoldemGame:
             equity_surf = FONT_MEDIUM.render(self.equity_display, True, (200, 200, 100))
             screen.blit(equity_surf, (SCREEN_WIDTH - equity_surf.get_width() - 20, SCREEN_HEIGHT - 100))
         
+        # Draw equity grid heatmap
+        if self._shown_equity_grid() is not None:
+            self._draw_equity_grid()
+        
         # Draw showdown info
         if self.showdown_info:
             for i, info in enumerate(self.showdown_info):
@@ -1048,14 +1237,21 @@ class TexasHoldemGame:
             game_over_surf = FONT_TITLE.render("GAME OVER", True, (255, 215, 0))
             screen.blit(game_over_surf, (SCREEN_WIDTH//2 - game_over_surf.get_width()//2, SCREEN_HEIGHT//2 - 50))
             
-            # Show final chip counts
+            # Show final chip counts with ICM tournament equity
+            icm = self.icm_equities()
             for i, player in enumerate(self.players):
-                chip_text = FONT_LARGE.render(f"{player.name}: {player.chips} chips", True, TEXT_COLOR)
+                chip_text = FONT_LARGE.render(f"{player.name}: {player.chips} chips (ICM {icm[player]:.1f}%)",
+                                              True, TEXT_COLOR)
                 screen.blit(chip_text, (SCREEN_WIDTH//2 - chip_text.get_width()//2, SCREEN_HEIGHT//2 + i*40))
             
             restart_text = FONT_MEDIUM.render("Press ESC to exit", True, (200, 200, 200))
             screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT - 50))
 
+        # Performance overlay, drawn on top of everything (its own cost isn't counted)
+        if self.show_hud:
+            self.frame_stats.record_draw(time.perf_counter() - draw_start)
+            self._draw_hud()
+
 # Main game execution
 if __name__ == "__main__":
     # Setup players (name, starting_chips) - First player is human
@@ -1068,5 +1264,16 @@ if __name__ == "__main__":
         ("Beta", 1000)
     ]
     
-    game = TexasHoldemGame(player_config, small_blind=50, big_blind=75)
+    parser = argparse.ArgumentParser(description="Texas Hold'em against computer bots")
+    parser.add_argument("--rng", choices=("secure", "seeded"), default="secure",
+                        help="backend that deals the cards (seeded replays the same deals)")
+    parser.add_argument("--seed", type=int, help="seed for the seeded backend")
+    args = parser.parse_args()
+    if args.seed is not None and args.rng != "seeded":
+        parser.error("--seed needs --rng seeded")
+    deal_rng = make_rng(args.rng, args.seed)
+    sim_rng = make_rng("seeded", None if args.seed is None else args.seed + 1)
+
+    game = TexasHoldemGame(player_config, small_blind=50, big_blind=75, history_path="hand_history.jsonl",
+                           rng=deal_rng, sim_rng=sim_rng)
     game.play_game(num_hands=20)
\ No newline at end of file
@@ -0,0 +1,108 @@
+# Equity of every starting hand on a given board, collapsed to the 13x13 grid.
+#
+# Each trial samples one set of opponent hands and one board completion, then
+# scores all 1,326 holdings against it in a single pass: the board's rank and
+# suit sums (a fast_eval.BoardState) are computed once per trial and each
+# holding only adds its two cards. Holdings that collide with the sampled cards sit that trial out,
+# which leaves every holding with an unbiased sample of its own runouts.
+
+import itertools
+import random
+
+from poker_core import FULL_DECK_IDS, RANKS_STR
+from fast_eval import CARD_RANK_BIT, CARD_RANK_WEIGHT, CARD_SUIT_WEIGHT, FastEvaluator
+
+GRID_SIZE = 13
+DEFAULT_GRID_TRIALS = 400
+
+
+def grid_cell(c1, c2):
+    # Row/col in the usual chart: aces first, suited above the diagonal
+    hi, lo = (c1, c2) if c1 >> 2 >= c2 >> 2 else (c2, c1)
+    row, col = 12 - (hi >> 2), 12 - (lo >> 2)
+    if row != col and (c1 & 3) != (c2 & 3):
+        row, col = col, row
+    return row, col
+
+
+def grid_label(row, col):
+    hi, lo = RANKS_STR[12 - min(row, col)], RANKS_STR[12 - max(row, col)]
+    if row == col:
+        return hi + lo
+    return hi + lo + ("s" if row < col else "o")
+
+
+class EquityGrid:
+    def __init__(self, evaluator=None):
+        self.evaluator = evaluator or FastEvaluator()
+        self.combos = list(itertools.combinations(FULL_DECK_IDS, 2))
+
+    def compute(self, board_ids, num_opponents, num_trials=DEFAULT_GRID_TRIALS, rng=None):
+        # Returns a 13x13 list of equities (None where every combo is blocked)
+        rng = rng or random
+        board_ids = list(board_ids)
+        board_set = set(board_ids)
+        live = [c for c in FULL_DECK_IDS if c not in board_set]
+        to_deal = 2 * num_opponents + 5 - len(board_ids)
+
+        combos = [(c1, c2, CARD_RANK_WEIGHT[c1] + CARD_RANK_WEIGHT[c2],
+                   CARD_SUIT_WEIGHT[c1] + CARD_SUIT_WEIGHT[c2])
+                  for c1, c2 in self.combos if c1 not in board_set and c2 not in board_set]
+        scores = [0.0] * len(combos)
+        counts = [0] * len(combos)
+
+        known_board = self.evaluator.board_state(board_ids)
+        trial_board = self.evaluator.board_state(board_ids)
+        flush_suit = self.evaluator.tables.flush_suit
+        flush_keys = self.evaluator.tables.flush_keys
+        rank_keys = self.evaluator.tables.rank_keys
+
+        for _ in range(num_trials):
+            dealt = rng.sample(live, to_deal)
+            trial_board.copy_from(known_board)
+            for c in dealt[2 * num_opponents:]:
+                trial_board.add(c)
+
+            best_opp = -1
+            num_best = 0
+            for i in range(0, 2 * num_opponents, 2):
+                key = trial_board.evaluate_hole(dealt[i], dealt[i + 1])
+                if key > best_opp:
+                    best_opp, num_best = key, 1
+                elif key == best_opp:
+                    num_best += 1
+            tie_share = 1.0 / (num_best + 1)
+
+            # Inline BoardState.evaluate_hole for the 1,326-combo inner loop
+            board_rank_sum = trial_board.rank_sum
+            board_suit_sum = trial_board.suit_sum
+            board_masks = trial_board.suit_masks
+            dealt_set = set(dealt)
+
+            for j, (c1, c2, rank_w, suit_w) in enumerate(combos):
+                if c1 in dealt_set or c2 in dealt_set:
+                    continue
+                suit = flush_suit[board_suit_sum + suit_w]
+                if suit < 0:
+                    key = rank_keys[board_rank_sum + rank_w]
+                else:
+                    mask = board_masks[suit]
+                    if c1 & 3 == suit:
+                        mask |= CARD_RANK_BIT[c1]
+                    if c2 & 3 == suit:
+                        mask |= CARD_RANK_BIT[c2]
+                    key = flush_keys[mask]
+                counts[j] += 1
+                if key > best_opp:
+                    scores[j] += 1.0
+                elif key == best_opp:
+                    scores[j] += tie_share
+
+        cell_scores = [[0.0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        cell_counts = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        for (c1, c2, _, _), score, count in zip(combos, scores, counts):
+            row, col = grid_cell(c1, c2)
+            cell_scores[row][col] += score
+            cell_counts[row][col] += count
+        return [[cell_scores[r][c] / cell_counts[r][c] if cell_counts[r][c] else None
+                 for c in range(GRID_SIZE)] for r in range(GRID_SIZE)]
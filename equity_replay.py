@@ -0,0 +1,209 @@
+# Per-street equity replay of recorded showdown hands, with luck-adjusted results.
+#
+# For every hand in a history file (one JSON object per line, as written by
+# TexasHoldemGame with history_path set) each showdown player's equity is
+# computed at the flop, turn and river in a single pass: the flop's runouts
+# are enumerated once from a shared BoardState, and the runouts that contain
+# the real turn card are exactly the turn's runouts, the one that also holds
+# the real river is the river's. Preflop equity is sampled by default, or
+# enumerated exactly over all five-card boards with --exact-preflop (slow:
+# about 1.7M boards per hand).
+#
+# Luck-adjusted result: the chips a player was expected to win at the street
+# where the money went in (side pots included), minus what they put in,
+# compared with what they actually won.
+#
+#     python equity_replay.py hand_history.jsonl
+#     python equity_replay.py --per-hand --exact-preflop --workers 8 hand_history.jsonl
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from poker_core import FULL_DECK_IDS, parse_cards
+from fast_eval import BoardState, default_tables
+from pot_ledger import PotLedger
+from runout_sampler import RunoutSampler
+from rng_backends import SeededRandom
+
+STREETS = ("pre_flop", "flop", "turn", "river")
+PREFLOP_SAMPLES = 1000
+
+
+class _Tally:
+    __slots__ = ("shares", "payouts", "runouts")
+
+    def __init__(self, num_players):
+        self.shares = [0.0] * num_players
+        self.payouts = [0.0] * num_players
+        self.runouts = 0
+
+
+class _PotModel:
+    # Expected payouts of one runout. With a single pot they follow from the
+    # win shares; otherwise the ledger resolves the side pots, memoized on the
+    # players' finishing order since that is all the split depends on.
+    def __init__(self, contributions, names):
+        self.names = names
+        self.ledger = PotLedger()
+        for name, amount in contributions.items():
+            self.ledger.add(name, amount)
+        self.pot = self.ledger.total()
+        top = max(contributions.values(), default=0)
+        self.single_pot = all(contributions.get(name, 0) == top for name in names)
+        self.seat_order = {name: i for i, name in enumerate(names)}
+        self._memo = {}
+
+    def payouts(self, keys):
+        order = tuple(sum(k > other for other in keys) for k in keys)
+        payouts = self._memo.get(order)
+        if payouts is None:
+            resolved, _ = self.ledger.resolve(dict(zip(self.names, order)), self.seat_order)
+            payouts = self._memo[order] = [resolved.get(name, 0) for name in self.names]
+        return payouts
+
+
+def _score(board, holes, pots, *tallies):
+    keys = [board.evaluate_hole(c1, c2) for c1, c2 in holes]
+    best = max(keys)
+    winners = [i for i, k in enumerate(keys) if k == best]
+    share = 1.0 / len(winners)
+    payouts = None if pots.single_pot else pots.payouts(keys)
+    for tally in tallies:
+        for i in winners:
+            tally.shares[i] += share
+        if payouts is None:
+            for i in winners:
+                tally.payouts[i] += share * pots.pot
+        else:
+            for i, amount in enumerate(payouts):
+                tally.payouts[i] += amount
+        tally.runouts += 1
+
+
+def _enumerate_boards(state, live, depth, start, holes, pots, tally, scratch):
+    # Every depth-card completion of state, each board state built from its parent
+    if depth == 0:
+        _score(state, holes, pots, tally)
+        return
+    child = scratch[depth]
+    for i in range(start, len(live) - depth + 1):
+        child.copy_from(state)
+        child.add(live[i])
+        _enumerate_boards(child, live, depth - 1, i + 1, holes, pots, tally, scratch)
+
+
+def replay_hand(hand, preflop_samples=PREFLOP_SAMPLES, exact_preflop=False, rng=None):
+    names = [p["name"] for p in hand["players"]]
+    holes = [tuple(parse_cards(p["hole"])) for p in hand["players"]]
+    board = parse_cards(hand["board"])
+    if len(board) != 5:
+        raise ValueError(f"Hand needs a full board, got {hand['board']!r}")
+    pots = _PotModel(hand["contributions"], names)
+    tables = default_tables()
+    known = {c for hole in holes for c in hole}
+    tallies = {street: _Tally(len(names)) for street in STREETS}
+
+    # Preflop: all five-card boards, or a batched sample of them
+    live = [c for c in FULL_DECK_IDS if c not in known]
+    empty = BoardState((), tables)
+    if exact_preflop:
+        scratch = [None] + [BoardState((), tables) for _ in range(5)]
+        _enumerate_boards(empty, live, 5, 0, holes, pots, tallies["pre_flop"], scratch)
+    else:
+        sampler = RunoutSampler(known, 0, 5, rng=rng)
+        batch = sampler.sample_batch(preflop_samples)
+        trial = BoardState((), tables)
+        for row in range(0, preflop_samples * 5, 5):
+            trial.reset(batch[row:row + 5])
+            _score(trial, holes, pots, tallies["pre_flop"])
+
+    # Flop, turn and river from one enumeration of the flop's turn/river pairs
+    flop, turn, river = board[:3], board[3], board[4]
+    flop_state = BoardState(flop, tables)
+    trial = BoardState(flop, tables)
+    live = [c for c in live if c not in flop]
+    for a, b in itertools.combinations(live, 2):
+        trial.copy_from(flop_state)
+        trial.add(a)
+        trial.add(b)
+        if turn not in (a, b):
+            _score(trial, holes, pots, tallies["flop"])
+        elif river not in (a, b):
+            _score(trial, holes, pots, tallies["flop"], tallies["turn"])
+        else:
+            _score(trial, holes, pots, tallies["flop"], tallies["turn"], tallies["river"])
+
+    decided = hand.get("decided", "river")
+    ev_tally = tallies[decided]
+    return {
+        "players": names,
+        "decided": decided,
+        "equity": {s: [x / t.runouts for x in t.shares] for s, t in tallies.items()},
+        "expected": [x / ev_tally.runouts for x in ev_tally.payouts],
+        "won": [hand["payouts"].get(name, 0) for name in names],
+        "invested": [hand["contributions"].get(name, 0) for name in names],
+    }
+
+
+def _replay_indexed(job):
+    index, hand, preflop_samples, exact_preflop, seed = job
+    return replay_hand(hand, preflop_samples, exact_preflop, SeededRandom(seed).spawn(index))
+
+
+def _read_hands(paths):
+    streams = [open(path) for path in paths] if paths else [sys.stdin]
+    for stream in streams:
+        with stream:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded showdowns with per-street equities and luck-adjusted results")
+    parser.add_argument("inputs", nargs="*", help="hand history files (default: stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--preflop-samples", type=int, default=PREFLOP_SAMPLES)
+    parser.add_argument("--exact-preflop", action="store_true",
+                        help="enumerate every preflop board instead of sampling")
+    parser.add_argument("--per-hand", action="store_true", help="print each hand's equities")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    jobs = ((i, hand, args.preflop_samples, args.exact_preflop, args.seed)
+            for i, hand in enumerate(_read_hands(args.inputs)))
+    totals = {}  # name -> [hands, actual net, expected net]
+    start = time.perf_counter()
+    num_hands = 0
+
+    default_tables()  # built once, inherited by forked workers
+    with multiprocessing.Pool(args.workers) as pool:
+        for result in pool.imap(_replay_indexed, jobs, chunksize=8):
+            num_hands += 1
+            for i, name in enumerate(result["players"]):
+                entry = totals.setdefault(name, [0, 0, 0.0])
+                entry[0] += 1
+                entry[1] += result["won"][i] - result["invested"][i]
+                entry[2] += result["expected"][i] - result["invested"][i]
+            if args.per_hand:
+                print(f"Hand {num_hands} (all in on the {result['decided'].replace('_', '-')}):")
+                for i, name in enumerate(result["players"]):
+                    equities = "  ".join(f"{result['equity'][s][i] * 100:5.1f}%" for s in STREETS)
+                    print(f"  {name:<12}{equities}   expected {result['expected'][i]:8.1f}   won {result['won'][i]}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{num_hands:,} hands in {elapsed:.1f}s ({num_hands / elapsed if elapsed else 0:,.1f} hands/s)")
+    print(f"{'Player':<12}{'Hands':>7}{'Actual':>10}{'Expected':>11}{'Luck':>10}")
+    for name, (hands, actual, expected) in sorted(totals.items(), key=lambda item: -item[1][2]):
+        print(f"{name:<12}{hands:>7}{actual:>10}{expected:>11.1f}{actual - expected:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# Streaming bulk hand evaluation from the command line, without pygame.
+#
+# Hands are read lazily from stdin or files, grouped into fixed-size chunks
+# and evaluated across a process pool. At most a few chunks per worker are in
+# flight at any time and results are written in input order as soon as each
+# chunk completes, so memory stays bounded however large the input is.
+#
+#     python eval_hands.py hands.txt                  # "AhKd|QsJsTs2c3d" per line
+#     cat export.csv | python eval_hands.py --format csv --columns hole,board
+#     python eval_hands.py --format bin --record-size 7 hands.bin -o scored.csv
+#
+# Text lines hold 5-7 cards; "|", spaces and commas are ignored. CSV input
+# takes the cards from the named columns of each row. Binary input is a
+# stream of fixed-size records, one card id (rank * 4 + suit) per byte,
+# padded with 0xFF for hands shorter than the record. Output is CSV:
+# hand, category, strength key (hex) and the best five cards.
+
+import argparse
+import collections
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+
+from poker_core import HAND_RANK_NAMES, NUM_CARDS, card_str, key_category, parse_cards
+import fast_eval
+import shared_tables
+
+CHUNK_SIZE = 10000
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+BINARY_PADDING = 0xFF
+
+_evaluator = None
+
+
+def _init_worker(tables_name):
+    global _evaluator
+    if tables_name:
+        shared_tables.init_worker(tables_name)
+    _evaluator = fast_eval.FastEvaluator()
+
+
+def _open_inputs(paths, binary):
+    # Files are opened one at a time as the readers reach them
+    if not paths:
+        yield sys.stdin.buffer if binary else sys.stdin
+        return
+    for path in paths:
+        try:
+            stream = open(path, "rb") if binary else open(path, newline="")
+        except OSError as e:
+            raise SystemExit(f"Cannot read {path}: {e.strerror}")
+        with stream:
+            yield stream
+
+
+def _read_text(streams):
+    for stream in streams:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def _read_csv(streams, columns):
+    for stream in streams:
+        for row in csv.DictReader(stream):
+            try:
+                yield "|".join(row[column] for column in columns)
+            except KeyError as e:
+                raise SystemExit(f"CSV input has no column {e}")
+
+
+def _read_binary(streams, record_size):
+    for stream in streams:
+        while True:
+            record = stream.read(record_size)
+            if not record:
+                break
+            if len(record) < record_size:
+                raise SystemExit("Truncated record at end of binary input")
+            yield "".join(card_str(c) if c < NUM_CARDS else "??" for c in record if c != BINARY_PADDING)
+
+
+def _best_five(ids, key):
+    for combo in itertools.combinations(ids, 5):
+        if _evaluator.evaluate_ids(combo) == key:
+            return sorted(combo, reverse=True)
+    return ids
+
+
+def _evaluate_chunk(hands):
+    # Returns (output rows, error messages) for one chunk of hand strings
+    rows = []
+    errors = []
+    for hand in hands:
+        try:
+            ids = parse_cards(hand.replace("|", ""))
+            if not 5 <= len(ids) <= 7:
+                raise ValueError(f"need 5-7 cards, got {len(ids)}")
+            if len(set(ids)) != len(ids):
+                raise ValueError("duplicate card")
+        except ValueError as e:
+            errors.append(f"{hand}: {e}")
+            continue
+        key = _evaluator.evaluate_ids(ids)
+        best = " ".join(card_str(c) for c in _best_five(ids, key))
+        rows.append((hand, HAND_RANK_NAMES[key_category(key)], f"{key:#x}", best))
+    return rows, errors
+
+
+def _chunks(hands, size):
+    while True:
+        chunk = list(itertools.islice(hands, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_stream(hands, writer, workers=1, chunk_size=CHUNK_SIZE, tables_name=None):
+    # Evaluates an iterable of hand strings and writes rows in input order.
+    # Returns (hands written, hands rejected).
+    written = rejected = 0
+
+    def emit(result):
+        nonlocal written, rejected
+        rows, errors = result
+        writer.writerows(rows)
+        for error in errors:
+            print(f"skipped {error}", file=sys.stderr)
+        written += len(rows)
+        rejected += len(errors)
+
+    if workers <= 1:
+        _init_worker(tables_name)
+        for chunk in _chunks(hands, chunk_size):
+            emit(_evaluate_chunk(chunk))
+        return written, rejected
+
+    # Tables built before the pool are inherited by forked workers
+    fast_eval.default_tables()
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(tables_name,)) as pool:
+        pending = collections.deque()
+        for chunk in _chunks(hands, chunk_size):
+            if len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                emit(pending.popleft().get())
+            pending.append(pool.apply_async(_evaluate_chunk, (chunk,)))
+        while pending:
+            emit(pending.popleft().get())
+    return written, rejected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate poker hands in bulk and stream the results as CSV")
+    parser.add_argument("inputs", nargs="*", help="input files (default: stdin)")
+    parser.add_argument("--format", choices=("text", "csv", "bin"), default="text")
+    parser.add_argument("--columns", default="hole,board",
+                        help="comma-separated CSV columns whose cards make up the hand")
+    parser.add_argument("--record-size", type=int, default=7,
+                        help="bytes per hand in binary input")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--shared-tables", action="store_true",
+                        help="publish lookup tables once and attach them in every worker")
+    args = parser.parse_args(argv)
+
+    binary = args.format == "bin"
+    streams = _open_inputs(args.inputs, binary)
+    if binary:
+        hands = _read_binary(streams, args.record_size)
+    elif args.format == "csv":
+        hands = _read_csv(streams, [c.strip() for c in args.columns.split(",")])
+    else:
+        hands = _read_text(streams)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    tables = shared_tables.SharedTables.publish() if args.shared_tables and args.workers > 1 else None
+    try:
+        writer = csv.writer(out)
+        writer.writerow(("hand", "category", "key", "best_five"))
+        written, rejected = evaluate_stream(hands, writer, args.workers, args.chunk_size,
+                                           tables.name if tables else None)
+    finally:
+        if tables:
+            tables.unlink()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{written:,} hands evaluated, {rejected:,} skipped", file=sys.stderr)
+    return 0 if not rejected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
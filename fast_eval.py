@@ -0,0 +1,226 @@
+# Table-driven hand evaluator working on integer card ids.
+#
+# A hand of 5-7 cards is reduced to two sums: a base-5 "rank count" sum and
+# a packed per-suit count. If no suit has five cards, the rank sum alone
+# determines the hand and is looked up directly; otherwise the flush suit's
+# rank bitmask is looked up in a 8192-entry flush table. Results are packed
+# strength keys (see poker_core.pack_key), ordered exactly like
+# HandEvaluator's (rank_code, tie_breakers) tuples.
+
+import itertools
+from array import array
+
+from poker_core import (
+    FULL_DECK_IDS, HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT,
+    FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH,
+    card_ids, pack_key,
+)
+
+RANK_COUNT_BASE = 5
+WHEEL_MASK = (1 << 12) | 0b1111  # A-2-3-4-5
+
+# Per-card contributions to the two sums
+CARD_RANK_WEIGHT = tuple(RANK_COUNT_BASE ** (c >> 2) for c in FULL_DECK_IDS)
+CARD_SUIT_WEIGHT = tuple(1 << (3 * (c & 3)) for c in FULL_DECK_IDS)
+CARD_RANK_BIT = tuple(1 << (c >> 2) for c in FULL_DECK_IDS)
+
+
+def _straight_high(rank_mask):
+    for high in range(12, 3, -1):
+        window = 0b11111 << (high - 4)
+        if rank_mask & window == window:
+            return high
+    if rank_mask & WHEEL_MASK == WHEEL_MASK:
+        return 3  # Five-high straight
+    return -1
+
+
+STRAIGHT_HIGH = tuple(_straight_high(m) for m in range(1 << 13))
+
+
+def _flush_key(rank_mask):
+    high = STRAIGHT_HIGH[rank_mask]
+    if high >= 0:
+        return pack_key(ROYAL_FLUSH if high == 12 else STRAIGHT_FLUSH, [high])
+    ranks = [r for r in range(12, -1, -1) if rank_mask >> r & 1][:5]
+    return pack_key(FLUSH, ranks)
+
+
+def _flush_suit(suit_sum):
+    for suit in range(4):
+        if (suit_sum >> (3 * suit)) & 7 >= 5:
+            return suit
+    return -1
+
+
+def _rank_counts_key(counts):
+    # counts maps rank -> count, inserted in descending rank order
+    desc = list(counts)
+    groups = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    top_rank, top_n = groups[0]
+
+    if top_n == 4:
+        kicker = next(r for r in desc if r != top_rank)
+        return pack_key(FOUR_OF_A_KIND, [top_rank, kicker])
+
+    second_rank, second_n = groups[1]
+    if top_n == 3 and second_n >= 2:
+        return pack_key(FULL_HOUSE, [top_rank, second_rank])
+
+    rank_mask = 0
+    for r in desc:
+        rank_mask |= 1 << r
+    high = STRAIGHT_HIGH[rank_mask]
+    if high >= 0:
+        return pack_key(STRAIGHT, [high])
+
+    if top_n == 3:
+        kickers = [r for r in desc if r != top_rank][:2]
+        return pack_key(THREE_OF_A_KIND, [top_rank] + kickers)
+
+    if top_n == 2 and second_n == 2:
+        kicker = next(r for r in desc if r != top_rank and r != second_rank)
+        return pack_key(TWO_PAIR, [top_rank, second_rank, kicker])
+
+    if top_n == 2:
+        kickers = [r for r in desc if r != top_rank][:3]
+        return pack_key(ONE_PAIR, [top_rank] + kickers)
+
+    return pack_key(HIGH_CARD, desc[:5])
+
+
+class LookupTables:
+    def __init__(self, flush_keys, flush_suit, rank_keys):
+        self.flush_keys = flush_keys  # indexed by 13-bit rank mask of the flush suit
+        self.flush_suit = flush_suit  # indexed by packed suit counts, -1 if no flush
+        self.rank_keys = rank_keys    # base-5 rank count sum -> key (non-flush hands)
+
+    @classmethod
+    def build(cls):
+        flush_keys = array('i', (
+            _flush_key(m) if bin(m).count("1") >= 5 else 0 for m in range(1 << 13)
+        ))
+        flush_suit = array('b', (_flush_suit(s) for s in range(1 << 12)))
+        rank_keys = {}
+        descending = range(12, -1, -1)
+        for size in (5, 6, 7):
+            for combo in itertools.combinations_with_replacement(descending, size):
+                counts = {}
+                for r in combo:
+                    counts[r] = counts.get(r, 0) + 1
+                if max(counts.values()) > 4:
+                    continue
+                rank_sum = sum(RANK_COUNT_BASE ** r for r in combo)
+                rank_keys[rank_sum] = _rank_counts_key(counts)
+        return cls(flush_keys, flush_suit, rank_keys)
+
+
+_default_tables = None
+
+
+def default_tables():
+    global _default_tables
+    if _default_tables is None:
+        _default_tables = LookupTables.build()
+    return _default_tables
+
+
+def set_default_tables(tables):
+    # Lets worker processes install tables attached from shared memory
+    global _default_tables
+    _default_tables = tables
+
+
+class FastEvaluator:
+    def __init__(self, tables=None):
+        self.tables = tables if tables is not None else default_tables()
+        self._flush_keys = self.tables.flush_keys
+        self._flush_suit = self.tables.flush_suit
+        self._rank_keys = self.tables.rank_keys
+
+    def evaluate_ids(self, ids):
+        # Strength key of the best 5-card hand among 5-7 card ids
+        rank_sum = 0
+        suit_sum = 0
+        for c in ids:
+            rank_sum += CARD_RANK_WEIGHT[c]
+            suit_sum += CARD_SUIT_WEIGHT[c]
+        suit = self._flush_suit[suit_sum]
+        if suit < 0:
+            return self._rank_keys[rank_sum]
+        rank_mask = 0
+        for c in ids:
+            if c & 3 == suit:
+                rank_mask |= CARD_RANK_BIT[c]
+        return self._flush_keys[rank_mask]
+
+    def board_state(self, board_ids):
+        return BoardState(board_ids, self.tables)
+
+    def evaluate(self, cards):
+        return self.evaluate_ids(card_ids(cards))
+
+
+class BoardState:
+    # Shared board cards reduced once (rank counts, suit counts, per-suit rank
+    # masks); each player's hole cards then only add their own contribution.
+    # The state is mutable so simulations can reuse one object per trial.
+    def __init__(self, board_ids=(), tables=None):
+        tables = tables if tables is not None else default_tables()
+        self._flush_keys = tables.flush_keys
+        self._flush_suit = tables.flush_suit
+        self._rank_keys = tables.rank_keys
+        self.suit_masks = [0, 0, 0, 0]
+        self.reset(board_ids)
+
+    def reset(self, board_ids=()):
+        self.rank_sum = 0  # base-5 rank counts
+        self.suit_sum = 0  # 3-bit count per suit
+        self.rank_mask = 0  # ranks present, for straight checks
+        self.num_cards = 0
+        masks = self.suit_masks
+        masks[0] = masks[1] = masks[2] = masks[3] = 0
+        for c in board_ids:
+            self.add(c)
+
+    def add(self, c):
+        self.rank_sum += CARD_RANK_WEIGHT[c]
+        self.suit_sum += CARD_SUIT_WEIGHT[c]
+        self.rank_mask |= CARD_RANK_BIT[c]
+        self.suit_masks[c & 3] |= CARD_RANK_BIT[c]
+        self.num_cards += 1
+
+    def copy_from(self, other):
+        self.rank_sum = other.rank_sum
+        self.suit_sum = other.suit_sum
+        self.rank_mask = other.rank_mask
+        self.num_cards = other.num_cards
+        self.suit_masks[:] = other.suit_masks
+
+    def evaluate_hole(self, c1, c2):
+        # Strength key of board + two hole cards (board of 3-5 cards)
+        suit = self._flush_suit[self.suit_sum + CARD_SUIT_WEIGHT[c1] + CARD_SUIT_WEIGHT[c2]]
+        if suit < 0:
+            return self._rank_keys[self.rank_sum + CARD_RANK_WEIGHT[c1] + CARD_RANK_WEIGHT[c2]]
+        mask = self.suit_masks[suit]
+        if c1 & 3 == suit:
+            mask |= CARD_RANK_BIT[c1]
+        if c2 & 3 == suit:
+            mask |= CARD_RANK_BIT[c2]
+        return self._flush_keys[mask]
+
+    def evaluate_ids(self, hole_ids):
+        # Same for any number of extra cards, as long as the total is 5-7
+        rank_sum = self.rank_sum
+        suit_sum = self.suit_sum
+        for c in hole_ids:
+            rank_sum += CARD_RANK_WEIGHT[c]
+            suit_sum += CARD_SUIT_WEIGHT[c]
+        suit = self._flush_suit[suit_sum]
+        if suit < 0:
+            return self._rank_keys[rank_sum]
+        mask = self.suit_masks[suit]
+        for c in hole_ids:
+            if c & 3 == suit:
+                mask |= CARD_RANK_BIT[c]
+        return self._flush_keys[mask]
@@ -0,0 +1,140 @@
+# Canonical flop indexing and a prebuilt per-flop texture database.
+#
+# Up to suit relabelling there are only 1,755 distinct flops. FlopIndexer maps
+# any three board cards to their canonical flop id, and FlopDatabase holds
+# features for each id (suit/pair/straight texture and how often every
+# two-card holding makes each hand category) so callers can reuse them instead
+# of recomputing per hand. Rebuild the data file with: python flop_db.py
+
+import itertools
+import json
+import os
+import sys
+from array import array
+
+from poker_core import FULL_DECK_IDS, card_ids, card_str, key_category
+from fast_eval import FastEvaluator
+
+NUM_CANONICAL_FLOPS = 1755
+SUIT_PERMUTATIONS = tuple(itertools.permutations(range(4)))
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "flop_db.json")
+
+# Rank windows a straight can occupy, wheel first
+STRAIGHT_WINDOWS = ((12, 0, 1, 2, 3),) + tuple(tuple(range(low, low + 5)) for low in range(9))
+
+
+def _flop_slot(a, b, c):
+    return (a * 52 + b) * 52 + c
+
+
+class FlopIndexer:
+    def __init__(self, ids=None, canonical_flops=None):
+        if ids is not None:
+            # Prebuilt tables, e.g. attached from shared memory
+            self._ids = ids
+            self.canonical_flops = canonical_flops
+            return
+        self._ids = array('h', [-1]) * (52 * 52 * 52)
+        self.canonical_flops = []  # flop id -> lowest sorted card-id triple in its class
+        for flop in itertools.combinations(FULL_DECK_IDS, 3):
+            if self._ids[_flop_slot(*flop)] >= 0:
+                continue
+            flop_id = len(self.canonical_flops)
+            self.canonical_flops.append(flop)
+            for perm in SUIT_PERMUTATIONS:
+                image = sorted((c & ~3) | perm[c & 3] for c in flop)
+                self._ids[_flop_slot(*image)] = flop_id
+
+    def flop_id_from_ids(self, ids):
+        a, b, c = sorted(ids)
+        if a == b or b == c:
+            raise ValueError("Flop cards must be distinct")
+        return self._ids[_flop_slot(a, b, c)]
+
+    def flop_id(self, cards):
+        # cards: the first three board Card objects
+        return self.flop_id_from_ids(card_ids(cards[:3]))
+
+
+_default_indexer = None
+
+
+def default_indexer():
+    global _default_indexer
+    if _default_indexer is None:
+        _default_indexer = FlopIndexer()
+    return _default_indexer
+
+
+def set_default_indexer(indexer):
+    global _default_indexer
+    _default_indexer = indexer
+
+
+def flop_texture(flop):
+    ranks = sorted({c >> 2 for c in flop}, reverse=True)
+    return {
+        "suits": len({c & 3 for c in flop}),  # 1 monotone, 2 two-tone, 3 rainbow
+        "paired": 3 - len(ranks),  # 0 unpaired, 1 paired, 2 trips
+        "high_rank": ranks[0],
+        "straight_windows": sum(1 for w in STRAIGHT_WINDOWS if all(r in w for r in ranks)),
+    }
+
+
+def _category_counts(evaluator, flop):
+    counts = [0] * 10
+    live = [c for c in FULL_DECK_IDS if c not in flop]
+    for hole in itertools.combinations(live, 2):
+        counts[key_category(evaluator.evaluate_ids(hole + flop))] += 1
+    return counts
+
+
+def category_percentile(entry, category):
+    # Share of all holdings on this flop that make a weaker hand category, ties counted as half
+    counts = entry["category_counts"]
+    return (sum(counts[:category]) + counts[category] / 2) / sum(counts)
+
+
+class FlopDatabase:
+    def __init__(self, indexer, entries):
+        self.indexer = indexer
+        self.entries = entries  # indexed by canonical flop id
+
+    @classmethod
+    def build(cls, indexer=None):
+        indexer = indexer or default_indexer()
+        evaluator = FastEvaluator()
+        entries = []
+        for flop_id, flop in enumerate(indexer.canonical_flops):
+            entry = {"id": flop_id, "flop": "".join(card_str(c) for c in flop)}
+            entry.update(flop_texture(flop))
+            entry["category_counts"] = _category_counts(evaluator, flop)
+            entries.append(entry)
+        return cls(indexer, entries)
+
+    @classmethod
+    def load(cls, path=DEFAULT_DB_PATH, indexer=None):
+        with open(path) as f:
+            data = json.load(f)
+        if len(data["flops"]) != NUM_CANONICAL_FLOPS:
+            raise ValueError(f"Flop database {path} has {len(data['flops'])} flops")
+        return cls(indexer or default_indexer(), data["flops"])
+
+    def save(self, path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write('{"flops": [\n')
+            f.write(",\n".join(json.dumps(e, separators=(",", ":")) for e in self.entries))
+            f.write("\n]}\n")
+
+    def lookup_ids(self, ids):
+        return self.entries[self.indexer.flop_id_from_ids(ids[:3])]
+
+    def lookup(self, cards):
+        return self.entries[self.indexer.flop_id(cards)]
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH
+    FlopDatabase.build().save(out_path)
+    print(f"Wrote {NUM_CANONICAL_FLOPS} flops to {out_path}")
@@ -0,0 +1,87 @@
+# Rolling frame timing and latency numbers behind the game's performance HUD.
+#
+# Frame times live in a fixed ring with a running sum and a histogram that
+# are both updated as frames enter and leave the window, so recording a
+# frame and reading FPS or the histogram are O(1) / O(bins). Kept free of
+# pygame; the game feeds it timestamps and draws the overlay itself.
+
+from array import array
+
+FRAME_WINDOW = 120
+HIST_BIN_MS = 5
+HIST_BINS = 12  # the last bin collects every frame slower than the others
+SMOOTHING = 0.1  # weight of the newest sample in the draw/flip averages
+
+
+def _bin(frame_ms):
+    return min(int(frame_ms // HIST_BIN_MS), HIST_BINS - 1)
+
+
+class FrameStats:
+    def __init__(self, window=FRAME_WINDOW):
+        self.frame_ms = array('d', bytes(8 * window))
+        self.draw_ms = 0.0
+        self.flip_ms = 0.0
+        self.input_latency_ms = None  # input dispatch to the next presented frame
+        self.equity_ms = None
+        self.equity_label = ""
+        self.reset()
+
+    def reset(self):
+        # Forget the window, e.g. after the overlay was off and frames went unmeasured
+        self.pos = 0
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * HIST_BINS
+        self._last_frame_end = None
+        self._input_pending = None
+
+    def record_draw(self, seconds):
+        self.draw_ms += (seconds * 1000 - self.draw_ms) * SMOOTHING
+
+    def record_flip(self, seconds):
+        self.flip_ms += (seconds * 1000 - self.flip_ms) * SMOOTHING
+
+    def input_dispatched(self, now):
+        # now: perf_counter() when an input was acted on; timed up to the next frame_done()
+        self._input_pending = now
+
+    def record_equity(self, label, seconds):
+        self.equity_label = label
+        self.equity_ms = seconds * 1000
+
+    def frame_done(self, now):
+        # now: perf_counter() right after the frame was presented
+        if self._last_frame_end is not None:
+            self._add_frame((now - self._last_frame_end) * 1000)
+        self._last_frame_end = now
+        if self._input_pending is not None:
+            self.input_latency_ms = (now - self._input_pending) * 1000
+            self._input_pending = None
+
+    def _add_frame(self, ms):
+        evicted_max = False
+        if self.count == len(self.frame_ms):
+            old = self.frame_ms[self.pos]
+            self.total_ms -= old
+            self.histogram[_bin(old)] -= 1
+            evicted_max = old >= self.max_ms
+        else:
+            self.count += 1
+        self.frame_ms[self.pos] = ms
+        self.total_ms += ms
+        self.histogram[_bin(ms)] += 1
+        if ms >= self.max_ms:
+            self.max_ms = ms
+        elif evicted_max:
+            # Only rescan the window when the slowest frame just slid out of it
+            self.max_ms = max(self.frame_ms)
+        self.pos = (self.pos + 1) % len(self.frame_ms)
+
+    def average_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def fps(self):
+        average = self.average_ms()
+        return 1000.0 / average if average else 0.0
@@ -0,0 +1,125 @@
+# Reference hand evaluator working on Card objects (anything with numeric
+# .rank/.suit). Kept free of pygame so tools can use it without the game window.
+
+import collections
+import itertools
+
+from poker_core import (
+    RANK_MAP, HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH,
+    FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH,
+    pack_key, unpack_key,
+)
+from fast_eval import FastEvaluator
+
+
+class HandEvaluator:
+    def __init__(self):
+        self.fast_evaluator = FastEvaluator()
+
+    def get_best_hand(self, seven_cards):
+        if len(seven_cards) < 5:
+            return (HIGH_CARD, [c.rank for c in sorted(seven_cards, reverse=True)], seven_cards)
+
+        key = self.get_strength_key(seven_cards)
+        rank_code, tie_breakers = unpack_key(key)
+        return rank_code, tie_breakers, self.best_five_cards(seven_cards, key)
+
+    def get_strength_key(self, cards):
+        # Single int encoding category and kickers; compare keys with plain int ops
+        if 5 <= len(cards) <= 7:
+            return self.fast_evaluator.evaluate(cards)
+        if len(cards) > 7:
+            # Every 5-card hand sits inside some 7-card subset
+            return max(self.fast_evaluator.evaluate(combo) for combo in itertools.combinations(cards, 7))
+        rank_code, tie_breakers, _ = self.get_best_hand(cards)
+        return pack_key(rank_code, tie_breakers)
+
+    def best_five_cards(self, cards, key):
+        for five_card_combo in itertools.combinations(cards, 5):
+            if self.fast_evaluator.evaluate(five_card_combo) == key:
+                return sorted(five_card_combo, key=lambda c: c.rank, reverse=True)
+        return list(cards)
+
+    def get_best_omaha_hand(self, hole_cards, board_cards):
+        # Omaha: exactly 2 of the 4 hole cards plus exactly 3 board cards
+        best_rank_tuple = (HIGH_CARD, [-1], [])
+
+        for hole_pair in itertools.combinations(hole_cards, 2):
+            for board_triple in itertools.combinations(board_cards, 3):
+                current_rank_tuple = self._evaluate_5_card_hand(list(hole_pair + board_triple))
+                if self._compare_rank_tuples(current_rank_tuple, best_rank_tuple) > 0:
+                    best_rank_tuple = current_rank_tuple
+
+        return best_rank_tuple[0], best_rank_tuple[1], list(best_rank_tuple[2])
+
+    def _compare_rank_tuples(self, rank_tuple1, rank_tuple2):
+        if rank_tuple1[0] != rank_tuple2[0]:
+            return rank_tuple1[0] - rank_tuple2[0]
+        
+        for tb1, tb2 in zip(rank_tuple1[1], rank_tuple2[1]):
+            if tb1 != tb2:
+                return tb1 - tb2
+        return 0
+
+    def _evaluate_5_card_hand(self, hand_cards):  # Expects exactly 5 cards
+        hand_cards.sort(key=lambda c: c.rank, reverse=True)
+        ranks = [card.rank for card in hand_cards]
+        suits = [card.suit for card in hand_cards]
+        
+        rank_counts = collections.Counter(ranks)
+        sorted_rank_counts = sorted(rank_counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+        is_flush = len(set(suits)) == 1
+        
+        is_straight = False
+        unique_sorted_ranks = sorted(list(set(ranks)), reverse=True)
+        if len(unique_sorted_ranks) >= 5:
+            if all(r in unique_sorted_ranks for r in [RANK_MAP['A'], RANK_MAP['2'], RANK_MAP['3'], RANK_MAP['4'], RANK_MAP['5']]):
+                is_straight = True
+                straight_high_rank = RANK_MAP['5']
+            else:
+                for i in range(len(unique_sorted_ranks) - 4):
+                    if unique_sorted_ranks[i] - unique_sorted_ranks[i+4] == 4:
+                        is_straight = True
+                        straight_high_rank = unique_sorted_ranks[i]
+                        break
+        
+        if is_straight and is_flush:
+            if straight_high_rank == RANK_MAP['A']:
+                return (ROYAL_FLUSH, [straight_high_rank], hand_cards)
+            return (STRAIGHT_FLUSH, [straight_high_rank], hand_cards)
+
+        if sorted_rank_counts[0][1] == 4:
+            quad_rank = sorted_rank_counts[0][0]
+            kicker = [r for r in ranks if r != quad_rank][0]
+            return (FOUR_OF_A_KIND, [quad_rank, kicker], hand_cards)
+
+        if sorted_rank_counts[0][1] == 3 and sorted_rank_counts[1][1] == 2:
+            trips_rank = sorted_rank_counts[0][0]
+            pair_rank = sorted_rank_counts[1][0]
+            return (FULL_HOUSE, [trips_rank, pair_rank], hand_cards)
+
+        if is_flush:
+            return (FLUSH, ranks, hand_cards)
+
+        if is_straight:
+            return (STRAIGHT, [straight_high_rank], hand_cards)
+
+        if sorted_rank_counts[0][1] == 3:
+            trips_rank = sorted_rank_counts[0][0]
+            kickers = sorted([r for r in ranks if r != trips_rank], reverse=True)[:2]
+            return (THREE_OF_A_KIND, [trips_rank] + kickers, hand_cards)
+
+        if sorted_rank_counts[0][1] == 2 and sorted_rank_counts[1][1] == 2:
+            high_pair_rank = sorted_rank_counts[0][0]
+            low_pair_rank = sorted_rank_counts[1][0]
+            kicker_ranks = [r for r in ranks if r != high_pair_rank and r != low_pair_rank]
+            kicker = kicker_ranks[0] if kicker_ranks else -1
+            return (TWO_PAIR, [high_pair_rank, low_pair_rank, kicker], hand_cards)
+
+        if sorted_rank_counts[0][1] == 2:
+            pair_rank = sorted_rank_counts[0][0]
+            kickers = sorted([r for r in ranks if r != pair_rank], reverse=True)[:3]
+            return (ONE_PAIR, [pair_rank] + kickers, hand_cards)
+        
+        return (HIGH_CARD, ranks, hand_cards)
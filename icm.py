@@ -0,0 +1,80 @@
+# Independent Chip Model (ICM) tournament equity.
+#
+# Under ICM a player finishes in the highest remaining place with probability
+# proportional to their share of the chips still in play. Rather than the
+# factorial recursion over finishing orders, the exact solver walks subsets
+# of already-placed players one level (place) at a time, so each subset's
+# probability and remaining chip total is computed once and shared by every
+# order that leads to it. Only levels that still pay are expanded, which keeps
+# 10+ player fields with a few paid places to a few hundred states. Fields
+# too big for that fall back to Monte Carlo: sorting exponential "finish
+# times" with rate equal to stack samples an ICM finishing order directly.
+
+import functools
+import math
+import random
+
+ICM_EXACT_STATE_LIMIT = 200000
+ICM_MONTE_CARLO_SAMPLES = 5000
+
+
+def _exact_state_count(num_players, num_paid):
+    return sum(math.comb(num_players, placed) for placed in range(min(num_paid, num_players)))
+
+
+@functools.lru_cache(maxsize=256)
+def _icm_exact(stacks, payouts):
+    n = len(stacks)
+    equities = [0.0] * n
+    # placed-players bitmask -> (probability, chips still in play)
+    level = {0: (1.0, float(sum(stacks)))}
+    for place in range(min(len(payouts), n)):
+        prize = payouts[place]
+        next_level = {}
+        for placed, (prob, remaining) in level.items():
+            for j in range(n):
+                if placed >> j & 1 or not stacks[j]:
+                    continue
+                p = prob * stacks[j] / remaining
+                equities[j] += p * prize
+                child = placed | (1 << j)
+                if child in next_level:
+                    next_level[child] = (next_level[child][0] + p, remaining - stacks[j])
+                else:
+                    next_level[child] = (p, remaining - stacks[j])
+        level = next_level
+    return tuple(equities)
+
+
+def _icm_monte_carlo(stacks, payouts, num_samples, rng):
+    n = len(stacks)
+    equities = [0.0] * n
+    alive = [i for i in range(n) if stacks[i] > 0]
+    paid = min(len(payouts), len(alive))
+    for _ in range(num_samples):
+        order = sorted(alive, key=lambda i: -math.log(1.0 - rng.random()) / stacks[i])
+        for place in range(paid):
+            equities[order[place]] += payouts[place]
+    return [e / num_samples for e in equities]
+
+
+def icm_equity(stacks, payouts, num_samples=ICM_MONTE_CARLO_SAMPLES, rng=None):
+    # stacks: chip counts; payouts: prize for 1st, 2nd, ... Returns each
+    # player's expected prize. Busted (zero) stacks finish below everyone
+    # still alive and split the bottom places they occupy.
+    stacks = tuple(stacks)
+    payouts = tuple(payouts)
+    num_alive = sum(1 for s in stacks if s > 0)
+    if num_alive == 0:
+        equities = [0.0] * len(stacks)
+    elif _exact_state_count(num_alive, len(payouts)) <= ICM_EXACT_STATE_LIMIT:
+        equities = list(_icm_exact(stacks, payouts))
+    else:
+        equities = _icm_monte_carlo(stacks, payouts, num_samples, rng or random)
+    num_busted = len(stacks) - num_alive
+    if num_busted:
+        share = sum(payouts[num_alive:len(stacks)]) / num_busted
+        for i, s in enumerate(stacks):
+            if s <= 0:
+                equities[i] = share
+    return equities
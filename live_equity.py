@@ -0,0 +1,92 @@
+# Live multi-way equities for an all-in runout, computed within a frame budget.
+#
+# Every known hand (up to a full six-handed table) is scored over the
+# remaining board runouts: all of them when the count is small enough to
+# enumerate, otherwise a batched random sample. Work happens in step() calls
+# with a time budget, so the render loop can keep drawing partial results
+# while the numbers converge.
+
+import itertools
+import math
+import time
+
+from poker_core import FULL_DECK_IDS
+from fast_eval import default_tables, BoardState
+from runout_sampler import RunoutSampler
+
+LIVE_EXACT_MAX_RUNOUTS = 20000
+LIVE_SAMPLE_TRIALS = 20000
+LIVE_CHUNK = 64  # runouts between deadline checks
+
+
+class LiveEquity:
+    def __init__(self, hands, board_ids, rng=None, tables=None):
+        # hands: list of hole-card id pairs, one per player still in the hand
+        self.hands = [tuple(h) for h in hands]
+        self.board_ids = list(board_ids)
+        known = set(self.board_ids)
+        for hand in self.hands:
+            known.update(hand)
+        live = [c for c in FULL_DECK_IDS if c not in known]
+        self.cards_needed = 5 - len(self.board_ids)
+
+        tables = tables if tables is not None else default_tables()
+        self._known_board = BoardState(self.board_ids, tables)
+        self._trial_board = BoardState(self.board_ids, tables)
+
+        num_runouts = math.comb(len(live), self.cards_needed)
+        self.exact = num_runouts <= LIVE_EXACT_MAX_RUNOUTS
+        self.target_trials = num_runouts if self.exact else LIVE_SAMPLE_TRIALS
+        if self.exact:
+            self._runouts = itertools.combinations(live, self.cards_needed)
+        else:
+            self._sampler = RunoutSampler(known, 0, self.cards_needed, rng=rng)
+
+        self.shares = [0.0] * len(self.hands)
+        self.trials = 0
+        self.elapsed = 0.0  # seconds spent in step() so far
+        self.done = False
+
+    def step(self, time_budget):
+        # Process runouts for up to time_budget seconds; returns True when finished
+        start = time.perf_counter()
+        deadline = start + time_budget
+        while not self.done and time.perf_counter() < deadline:
+            chunk = min(LIVE_CHUNK, self.target_trials - self.trials)
+            if self.exact:
+                runouts = list(itertools.islice(self._runouts, chunk))
+                for runout in runouts:
+                    self._score(runout)
+            else:
+                batch = self._sampler.sample_batch(chunk)
+                width = self.cards_needed
+                for row in range(0, chunk * width, width):
+                    self._score(batch[row:row + width])
+            if self.trials >= self.target_trials:
+                self.done = True
+        self.elapsed += time.perf_counter() - start
+        return self.done
+
+    def _score(self, runout):
+        board = self._trial_board
+        board.copy_from(self._known_board)
+        for c in runout:
+            board.add(c)
+        best_key = -1
+        winners = []
+        for i, (c1, c2) in enumerate(self.hands):
+            key = board.evaluate_hole(c1, c2)
+            if key > best_key:
+                best_key = key
+                winners = [i]
+            elif key == best_key:
+                winners.append(i)
+        share = 1.0 / len(winners)
+        for i in winners:
+            self.shares[i] += share
+        self.trials += 1
+
+    def equities(self):
+        if not self.trials:
+            return [1.0 / len(self.hands)] * len(self.hands)
+        return [s / self.trials for s in self.shares]
@@ -0,0 +1,111 @@
+# Pot-Limit Omaha evaluation: exactly two of four hole cards plus three board cards.
+#
+# The board is decomposed once into its three-card subsets (distinct rank
+# sums, plus the rank masks of monotone triples per suit) and shared by every
+# player. A holding then only combines its six hole pairs with those triples
+# through the same lookup tables fast_eval uses, instead of running 60
+# separate 5-card evaluations.
+
+import itertools
+import random
+
+from poker_core import FULL_DECK_IDS
+from fast_eval import CARD_RANK_BIT, CARD_RANK_WEIGHT, FastEvaluator
+
+OMAHA_HOLE_CARDS = 4
+HOLE_PAIR_INDEXES = tuple(itertools.combinations(range(OMAHA_HOLE_CARDS), 2))
+
+
+class OmahaBoard:
+    def __init__(self, board_ids):
+        if not 3 <= len(board_ids) <= 5:
+            raise ValueError("Omaha evaluation needs 3 to 5 board cards")
+        rank_sums = set()
+        self.flush_triples = ([], [], [], [])  # per suit: rank masks of monotone triples
+        for a, b, c in itertools.combinations(board_ids, 3):
+            rank_sums.add(CARD_RANK_WEIGHT[a] + CARD_RANK_WEIGHT[b] + CARD_RANK_WEIGHT[c])
+            suit = a & 3
+            if b & 3 == suit and c & 3 == suit:
+                self.flush_triples[suit].append(CARD_RANK_BIT[a] | CARD_RANK_BIT[b] | CARD_RANK_BIT[c])
+        self.rank_sums = tuple(rank_sums)
+        self.pair_best = {}  # hole-pair rank sum -> best non-flush key, filled lazily
+
+
+class OmahaEvaluator:
+    def __init__(self, evaluator=None):
+        self.evaluator = evaluator or FastEvaluator()
+        self._rank_keys = self.evaluator.tables.rank_keys
+        self._flush_keys = self.evaluator.tables.flush_keys
+
+    def evaluate_ids(self, hole_ids, board_ids):
+        return self.evaluate_on_board(hole_ids, OmahaBoard(board_ids))
+
+    def evaluate_on_board(self, hole_ids, board):
+        # Strength key of the best exactly-2-plus-3 hand
+        rank_keys = self._rank_keys
+        flush_keys = self._flush_keys
+        flush_triples = board.flush_triples
+        best = 0
+        pair_sums = set()
+        for i, j in HOLE_PAIR_INDEXES:
+            a, b = hole_ids[i], hole_ids[j]
+            pair_sums.add(CARD_RANK_WEIGHT[a] + CARD_RANK_WEIGHT[b])
+            suit = a & 3
+            if b & 3 == suit and flush_triples[suit]:
+                pair_mask = CARD_RANK_BIT[a] | CARD_RANK_BIT[b]
+                for triple_mask in flush_triples[suit]:
+                    key = flush_keys[pair_mask | triple_mask]
+                    if key > best:
+                        best = key
+        # Best non-flush hand per distinct hole-pair rank sum, memoized on the board
+        pair_best = board.pair_best
+        triple_sums = board.rank_sums
+        for pair_sum in pair_sums:
+            key = pair_best.get(pair_sum)
+            if key is None:
+                key = 0
+                for triple_sum in triple_sums:
+                    triple_key = rank_keys[pair_sum + triple_sum]
+                    if triple_key > key:
+                        key = triple_key
+                pair_best[pair_sum] = key
+            if key > best:
+                best = key
+        return best
+
+
+class OmahaEquityCalculator:
+    def __init__(self, evaluator=None):
+        self.omaha = OmahaEvaluator(evaluator)
+
+    def calculate_equity(self, hole_ids, board_ids, num_opponents, num_simulations=1000, rng=None):
+        rng = rng or random
+        board_ids = list(board_ids)
+        known = set(hole_ids) | set(board_ids)
+        live = [c for c in FULL_DECK_IDS if c not in known]
+        opp_cards = OMAHA_HOLE_CARDS * num_opponents
+        to_deal = opp_cards + 5 - len(board_ids)
+        if num_simulations <= 0 or to_deal > len(live):
+            return 0.0
+
+        evaluate = self.omaha.evaluate_on_board
+        score = 0.0
+        for _ in range(num_simulations):
+            dealt = rng.sample(live, to_deal)
+            board = OmahaBoard(board_ids + dealt[opp_cards:])
+            hero_key = evaluate(hole_ids, board)
+
+            best_opp = -1
+            num_best = 0
+            for i in range(0, opp_cards, OMAHA_HOLE_CARDS):
+                key = evaluate(dealt[i:i + OMAHA_HOLE_CARDS], board)
+                if key > best_opp:
+                    best_opp, num_best = key, 1
+                elif key == best_opp:
+                    num_best += 1
+
+            if hero_key > best_opp:
+                score += 1
+            elif hero_key == best_opp:
+                score += 1 / (num_best + 1)
+        return score / num_simulations
@@ -0,0 +1,111 @@
+# Incremental per-opponent tendencies (VPIP, PFR, 3-bet, c-bet, fold to raise).
+#
+# Every stat is a fixed-size ring of its most recent opportunities with a
+# running hit count, so recording an action and reading a frequency are both
+# O(1) and old behaviour slides out of the window over a long session. The
+# tracker is fed each betting action as it happens and keeps just enough
+# per-hand state (raises this street, preflop aggressor, VPIP/PFR flags) to
+# classify it without rescanning the hand.
+
+STATS_WINDOW = 100
+STATS_PRIOR_WEIGHT = 10  # pseudo-opportunities blended in while a window is nearly empty
+
+
+class StatWindow:
+    __slots__ = ("bits", "pos", "count", "hits")
+
+    def __init__(self, size=STATS_WINDOW):
+        self.bits = bytearray(size)
+        self.pos = 0
+        self.count = 0
+        self.hits = 0
+
+    def record(self, hit):
+        hit = 1 if hit else 0
+        if self.count == len(self.bits):
+            self.hits -= self.bits[self.pos]
+        else:
+            self.count += 1
+        self.bits[self.pos] = hit
+        self.hits += hit
+        self.pos = (self.pos + 1) % len(self.bits)
+
+    def rate(self, prior=0.5, weight=STATS_PRIOR_WEIGHT):
+        # Frequency over the window, shrunk towards prior when samples are few
+        return (self.hits + prior * weight) / (self.count + weight)
+
+
+class PlayerStats:
+    def __init__(self, window=STATS_WINDOW):
+        self.hands = 0
+        self.vpip = StatWindow(window)           # voluntarily put chips in preflop, per hand
+        self.pfr = StatWindow(window)            # raised preflop, per hand
+        self.three_bet = StatWindow(window)      # re-raised when facing one preflop raise
+        self.cbet = StatWindow(window)           # bet the flop as preflop aggressor when checked to
+        self.fold_to_raise = StatWindow(window)  # folded when facing a bet or raise
+
+
+class StatsTracker:
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.players = {}  # player -> PlayerStats
+        self.street = None
+        self.street_raises = 0
+        self.last_raiser = None  # who made the current bet this street (None before any)
+        self.preflop_aggressor = None
+        self._cbet_open = False
+        self._hand_flags = {}  # player -> [vpip, pfr] for the hand in progress
+
+    def stats(self, player):
+        stats = self.players.get(player)
+        if stats is None:
+            stats = self.players[player] = PlayerStats(self.window)
+        return stats
+
+    def start_hand(self, players):
+        self._hand_flags = {p: [False, False] for p in players if p.hole_cards}
+        self.preflop_aggressor = None
+        self.street = None
+
+    def start_street(self, street_name):
+        self.street = street_name
+        self.street_raises = 0
+        self.last_raiser = None
+        self._cbet_open = street_name == "Flop" and self.preflop_aggressor is not None
+
+    def record_action(self, player, action, to_call, raised):
+        # to_call: chips the player faced; raised: the action increased the bet to match
+        stats = self.stats(player)
+        preflop = self.street == "Pre-flop"
+        facing_raise = to_call > 0 and self.street_raises > 0
+
+        if preflop:
+            flags = self._hand_flags.get(player)
+            if flags is not None:
+                flags[0] |= raised or (action in ("call", "allin") and to_call > 0)
+                flags[1] |= raised
+            if self.street_raises == 1 and to_call > 0:
+                stats.three_bet.record(raised)
+        elif self._cbet_open and self.street_raises == 0:
+            if player is self.preflop_aggressor:
+                stats.cbet.record(raised)
+                self._cbet_open = False
+            elif raised:
+                self._cbet_open = False  # someone bet into the aggressor first
+
+        if facing_raise:
+            stats.fold_to_raise.record(action == "fold")
+
+        if raised:
+            self.street_raises += 1
+            self.last_raiser = player
+            if preflop:
+                self.preflop_aggressor = player
+
+    def end_hand(self):
+        for player, (vpip, pfr) in self._hand_flags.items():
+            stats = self.stats(player)
+            stats.hands += 1
+            stats.vpip.record(vpip)
+            stats.pfr.record(pfr)
+        self._hand_flags = {}
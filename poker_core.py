@@ -0,0 +1,109 @@
+# Shared poker constants and card/strength-key helpers.
+#
+# Nothing in here touches pygame, so analysis tools can import it without
+# opening the game window.
+
+RANKS_STR = "23456789TJQKA"
+SUITS_STR = "CDHS"  # Clubs, Diamonds, Hearts, Spades
+RANK_MAP = {rank: i for i, rank in enumerate(RANKS_STR)}
+RANK_MAP_REV = {i: rank for rank, i in RANK_MAP.items()}
+
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+ROYAL_FLUSH = 9
+
+HAND_RANK_NAMES = {
+    ROYAL_FLUSH: "Royal Flush",
+    STRAIGHT_FLUSH: "Straight Flush",
+    FOUR_OF_A_KIND: "Four of a Kind",
+    FULL_HOUSE: "Full House",
+    FLUSH: "Flush",
+    STRAIGHT: "Straight",
+    THREE_OF_A_KIND: "Three of a Kind",
+    TWO_PAIR: "Two Pair",
+    ONE_PAIR: "One Pair",
+    HIGH_CARD: "High Card"
+}
+
+# Cards as small ints: id = rank * 4 + suit, so 0 is 2C and 51 is AS.
+NUM_CARDS = 52
+FULL_DECK_IDS = tuple(range(NUM_CARDS))
+
+
+def card_id(card):
+    # Works for anything with numeric .rank/.suit (the game's Card class)
+    return card.rank * 4 + card.suit
+
+
+def card_ids(cards):
+    return [c.rank * 4 + c.suit for c in cards]
+
+
+def parse_card(text):
+    # "Ah", "td", "AS" -> card id. Suits are case-insensitive.
+    if len(text) != 2:
+        raise ValueError(f"Invalid card: {text!r}")
+    rank_str, suit_str = text[0].upper(), text[1].upper()
+    if rank_str not in RANK_MAP:
+        raise ValueError(f"Invalid rank: {text[0]}")
+    if suit_str not in SUITS_STR:
+        raise ValueError(f"Invalid suit: {text[1]}")
+    return RANK_MAP[rank_str] * 4 + SUITS_STR.index(suit_str)
+
+
+def parse_cards(text):
+    # "AhKd" or "Ah Kd" -> list of card ids
+    text = text.replace(" ", "").replace(",", "")
+    if len(text) % 2:
+        raise ValueError(f"Invalid card string: {text!r}")
+    return [parse_card(text[i:i + 2]) for i in range(0, len(text), 2)]
+
+
+def card_str(cid):
+    return f"{RANKS_STR[cid >> 2]}{SUITS_STR[cid & 3]}"
+
+
+# Strength keys pack a hand category and its tie-breakers into one int:
+# category in the top bits, then up to five 4-bit ranks, most significant
+# first. Comparing keys with plain int ops gives the same ordering as
+# comparing (category, tie_breakers) lexicographically.
+KEY_CATEGORY_SHIFT = 20
+TIE_BREAKER_COUNTS = {
+    HIGH_CARD: 5,
+    ONE_PAIR: 4,
+    TWO_PAIR: 3,
+    THREE_OF_A_KIND: 3,
+    STRAIGHT: 1,
+    FLUSH: 5,
+    FULL_HOUSE: 2,
+    FOUR_OF_A_KIND: 2,
+    STRAIGHT_FLUSH: 1,
+    ROYAL_FLUSH: 1,
+}
+
+
+def pack_key(category, tie_breakers):
+    key = category
+    for i in range(5):
+        key <<= 4
+        if i < len(tie_breakers) and tie_breakers[i] > 0:
+            key |= tie_breakers[i]
+    return key
+
+
+def unpack_key(key):
+    category = key >> KEY_CATEGORY_SHIFT
+    count = TIE_BREAKER_COUNTS[category]
+    tie_breakers = [(key >> (16 - 4 * i)) & 0xF for i in range(count)]
+    return category, tie_breakers
+
+
+def key_category(key):
+    return key >> KEY_CATEGORY_SHIFT
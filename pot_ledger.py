@@ -0,0 +1,72 @@
+# Per-player pot contributions and main/side pot resolution at showdown.
+#
+# The betting loop records every chip a player puts in (O(1) per action).
+# At showdown one sort of the contributors by amount splits the pot into
+# levels: each level's slice is contested by the live players who put in at
+# least that much, walking from the top level down so the set of eligible
+# players only grows. Chips stay integers; a slice that doesn't divide
+# evenly gives its odd chips one at a time to the tied winners closest to
+# the left of the button.
+
+
+class PotLedger:
+    def __init__(self):
+        self.contributions = {}  # player -> chips put in this hand
+
+    def reset(self):
+        self.contributions.clear()
+
+    def add(self, player, amount):
+        if amount > 0:
+            self.contributions[player] = self.contributions.get(player, 0) + amount
+
+    def total(self):
+        return sum(self.contributions.values())
+
+    def resolve(self, hand_keys, seat_order):
+        # hand_keys: {player: strength key} for everyone still in the hand
+        # seat_order: {player: seats left of the button} for odd-chip order
+        # Returns (payouts {player: chips}, pots [(amount, winners)] main pot first)
+        entries = sorted(self.contributions.items(), key=lambda item: item[1])
+        slices = []  # (level, chips, index of first contributor at that level)
+        prev_level = 0
+        for i, (_, amount) in enumerate(entries):
+            if amount > prev_level:
+                slices.append((amount, (amount - prev_level) * (len(entries) - i), i))
+                prev_level = amount
+
+        payouts = {}
+        pots = []
+        best_key = -1
+        best_players = []
+        next_eligible = len(entries) - 1
+        carry = 0
+        for level, chips, first_idx in reversed(slices):
+            while next_eligible >= first_idx:
+                player = entries[next_eligible][0]
+                key = hand_keys.get(player)
+                if key is not None:
+                    if key > best_key:
+                        best_key, best_players = key, [player]
+                    elif key == best_key:
+                        best_players.append(player)
+                next_eligible -= 1
+
+            chips += carry
+            if not best_players:
+                # Only folded players reached this level; the chips drop to the next pot down
+                carry = chips
+                continue
+            carry = 0
+
+            winners = sorted(best_players, key=lambda p: seat_order[p])
+            share, odd_chips = divmod(chips, len(winners))
+            for i, winner in enumerate(winners):
+                payouts[winner] = payouts.get(winner, 0) + share + (1 if i < odd_chips else 0)
+            if pots and pots[-1][1] == winners:
+                pots[-1] = (pots[-1][0] + chips, winners)
+            else:
+                pots.append((chips, winners))
+
+        pots.reverse()
+        return payouts, pots
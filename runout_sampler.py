@@ -0,0 +1,46 @@
+# Batched sampling of opponent hands and board completions for equity sims.
+#
+# Instead of rebuilding and shuffling a deck per trial, the live cards live
+# in one int array and each trial runs a partial Fisher-Yates over just the
+# cards it needs. Because every prefix shuffle leaves the array a valid
+# permutation, trials can keep shuffling the same array without resetting it.
+# A whole batch is written into one flat, reused (num_rows, row_width) buffer.
+
+import random
+from array import array
+
+from poker_core import FULL_DECK_IDS
+
+
+class RunoutSampler:
+    def __init__(self, known_ids, num_opponents, board_cards_needed, hole_cards=2, rng=None):
+        known = set(known_ids)
+        self.deck = array('B', (c for c in FULL_DECK_IDS if c not in known))
+        self.opponent_cards = hole_cards * num_opponents
+        self.row_width = self.opponent_cards + board_cards_needed
+        if self.row_width > len(self.deck):
+            raise ValueError("Not enough cards left to deal")
+        self.rng = rng or random
+        self._batch = array('B')
+
+    def sample_batch(self, num_rows):
+        # Row-major flat buffer: each row holds the opponents' hole cards
+        # followed by the board completion. The buffer is reused by the next call.
+        width = self.row_width
+        size = num_rows * width
+        if len(self._batch) != size:
+            self._batch = array('B', bytes(size))
+        batch = self._batch
+        deck = self.deck
+        remaining = [len(deck) - i for i in range(width)]
+        rand = self.rng.random
+        out = 0
+        for _ in range(num_rows):
+            for i in range(width):
+                j = i + int(rand() * remaining[i])
+                card = deck[j]
+                deck[j] = deck[i]
+                deck[i] = card
+                batch[out] = card
+                out += 1
+        return batch
@@ -0,0 +1,215 @@
+# Publish the evaluator and flop lookup tables once and attach them zero-copy.
+#
+# The parent process builds the tables and copies them into one flat buffer,
+# either a multiprocessing.shared_memory block or a read-only file that
+# workers mmap. Workers attach memoryviews straight onto that buffer, so a
+# pool's memory stays roughly flat as workers are added and no worker pays
+# for table construction. Typical use:
+#
+#     tables = SharedTables.publish()
+#     with multiprocessing.Pool(initializer=init_worker, initargs=(tables.name,)) as pool:
+#         ...
+#     tables.unlink()
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from multiprocessing import shared_memory
+
+import fast_eval
+import flop_db
+from fast_eval import LookupTables
+
+TABLES_MAGIC = b"PKTABLE1"
+HEADER_PREFIX = struct.Struct("<8sQ")  # magic, JSON header length
+SEGMENT_ALIGN = 8
+
+
+class SortedLookup:
+    # Read-only mapping over parallel sorted key/value arrays. Lookups are a
+    # C-level bisect over the buffer, so nothing is copied into a dict.
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+    def __getitem__(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError(key)
+        return self.values[i]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _table_arrays(tables=None, indexer=None):
+    tables = tables or fast_eval.default_tables()
+    indexer = indexer or flop_db.default_indexer()
+    rank_sums = sorted(tables.rank_keys)
+    canonical = array('B')
+    for flop in indexer.canonical_flops:
+        canonical.extend(flop)
+    return {
+        "flush_keys": array('i', tables.flush_keys),
+        "flush_suit": array('b', tables.flush_suit),
+        "rank_sums": array('q', rank_sums),
+        "rank_values": array('i', (tables.rank_keys[s] for s in rank_sums)),
+        "flop_ids": array('h', indexer._ids),
+        "canonical_flops": canonical,
+    }
+
+
+def _layout(arrays):
+    segments = {}
+    offset = 0
+    for name, arr in arrays.items():
+        segments[name] = {"typecode": arr.typecode, "offset": offset, "length": len(arr)}
+        offset += -(-len(arr) * arr.itemsize // SEGMENT_ALIGN) * SEGMENT_ALIGN
+    header = json.dumps(segments).encode()
+    header += b" " * (-(HEADER_PREFIX.size + len(header)) % SEGMENT_ALIGN)
+    data_start = HEADER_PREFIX.size + len(header)
+    return HEADER_PREFIX.pack(TABLES_MAGIC, len(header)) + header, data_start, data_start + offset
+
+
+def _serialize_into(buf, arrays):
+    prefix, data_start, _ = _layout(arrays)
+    buf[:len(prefix)] = prefix
+    segments = json.loads(prefix[HEADER_PREFIX.size:])
+    for name, arr in arrays.items():
+        start = data_start + segments[name]["offset"]
+        raw = arr.tobytes()
+        buf[start:start + len(raw)] = raw
+
+
+class SharedTables:
+    def __init__(self, buffer, owner=None, name=None):
+        self.name = name
+        self._owner = owner  # SharedMemory or mmap that backs the buffer
+        self._views = [buffer]
+
+        magic, header_len = HEADER_PREFIX.unpack_from(buffer)
+        if magic != TABLES_MAGIC:
+            raise ValueError("Not a lookup-table buffer")
+        header_end = HEADER_PREFIX.size + header_len
+        segments = json.loads(bytes(buffer[HEADER_PREFIX.size:header_end]))
+
+        views = {}
+        for seg_name, seg in segments.items():
+            start = header_end + seg["offset"]
+            size = seg["length"] * array(seg["typecode"]).itemsize
+            raw = buffer[start:start + size]
+            views[seg_name] = raw.cast(seg["typecode"])
+            self._views += [raw, views[seg_name]]
+
+        self.lookup_tables = LookupTables(
+            views["flush_keys"],
+            views["flush_suit"],
+            SortedLookup(views["rank_sums"], views["rank_values"]),
+        )
+        flops = views["canonical_flops"]
+        self.flop_indexer = flop_db.FlopIndexer(
+            views["flop_ids"],
+            [tuple(flops[i:i + 3]) for i in range(0, len(flops), 3)],
+        )
+
+    @classmethod
+    def publish(cls, name=None):
+        arrays = _table_arrays()
+        _, _, total = _layout(arrays)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=total)
+        _serialize_into(shm.buf, arrays)
+        return cls(shm.buf, owner=shm, name=shm.name)
+
+    @classmethod
+    def attach(cls, name):
+        if sys.version_info >= (3, 13):
+            # Only the publisher should unlink the block
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, owner=shm, name=name)
+
+    @staticmethod
+    def write_file(path):
+        # Writes the tables to a file that map_file() can share between processes
+        arrays = _table_arrays()
+        _, _, total = _layout(arrays)
+        buf = bytearray(total)
+        _serialize_into(memoryview(buf), arrays)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buf)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def map_file(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped), owner=mapped, name=path)
+
+    def install(self):
+        # Make these tables the process-wide defaults for new evaluators/indexers
+        fast_eval.set_default_tables(self.lookup_tables)
+        flop_db.set_default_indexer(self.flop_indexer)
+
+    def close(self):
+        self.lookup_tables = None
+        self.flop_indexer = None
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def unlink(self):
+        # Publisher only: release the shared memory block for good
+        owner = self._owner
+        self.close()
+        if isinstance(owner, shared_memory.SharedMemory):
+            owner.unlink()
+
+
+_worker_tables = None
+
+
+def init_worker(name_or_path):
+    # Pool initializer: attach published tables (shared memory name or mapped file path)
+    global _worker_tables
+    if os.path.exists(name_or_path):
+        _worker_tables = SharedTables.map_file(name_or_path)
+    else:
+        _worker_tables = SharedTables.attach(name_or_path)
+    _worker_tables.install()
+
+
+def _worker_probe(_):
+    fast_eval.FastEvaluator().evaluate_ids(range(7))
+    return os.getpid()
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    start = time.perf_counter()
+    fast_eval.default_tables()
+    flop_db.default_indexer()
+    print(f"Building tables in-process: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    shared = SharedTables.publish()
+    try:
+        start = time.perf_counter()
+        # Spawned workers start from a fresh interpreter, so nothing is inherited
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(num_workers, initializer=init_worker, initargs=(shared.name,)) as pool:
+            pids = pool.map(_worker_probe, range(num_workers * 4))
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{len(set(pids))} workers attached to {shared.name} and evaluated in {elapsed:.0f} ms total")
+    finally:
+        shared.unlink()
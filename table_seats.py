@@ -0,0 +1,82 @@
+# Incremental seat bookkeeping for the betting loop.
+#
+# Seats are bits in a few int masks (still in the hand, all-in, can still
+# act, acted since the last bet or raise) kept next to their popcounts, so
+# folds, all-ins and "has everyone acted?" are O(1) updates and checks no
+# matter how many seats the table has. The next actor is found by rotating
+# the can-act mask around the seat ring and taking its lowest set bit, which
+# is a couple of word-sized int operations for any realistic table.
+
+
+def _lowest_seat(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+class SeatTracker:
+    def __init__(self):
+        self.start_hand([])
+
+    def start_hand(self, players):
+        # Seats dealt in (holding cards) and not yet folded are in the hand;
+        # a blind that emptied a stack already counts as all-in.
+        self.num_seats = len(players)
+        self.in_hand = 0
+        self.all_in = 0
+        for seat, player in enumerate(players):
+            if player.hole_cards and not player.is_folded:
+                self.in_hand |= 1 << seat
+                if player.is_all_in:
+                    self.all_in |= 1 << seat
+        self.actors = self.in_hand & ~self.all_in
+        self.num_in_hand = bin(self.in_hand).count("1")
+        self.num_actors = bin(self.actors).count("1")
+        self.start_street()
+
+    def start_street(self):
+        self.acted = 0
+        self.num_acted = 0
+
+    def fold(self, seat):
+        bit = 1 << seat
+        if self.in_hand & bit:
+            self.in_hand &= ~bit
+            self.num_in_hand -= 1
+            self._stop_acting(bit)
+
+    def go_all_in(self, seat):
+        bit = 1 << seat
+        if self.in_hand & bit and not self.all_in & bit:
+            self.all_in |= bit
+            self._stop_acting(bit)
+
+    def _stop_acting(self, bit):
+        if self.actors & bit:
+            self.actors &= ~bit
+            self.num_actors -= 1
+            if self.acted & bit:
+                self.acted &= ~bit
+                self.num_acted -= 1
+
+    def mark_acted(self, seat):
+        bit = 1 << seat
+        if self.actors & bit and not self.acted & bit:
+            self.acted |= bit
+            self.num_acted += 1
+
+    def new_bet_level(self, seat):
+        # A bet or raise reopens the action for everyone but the bettor
+        self.acted = 0
+        self.num_acted = 0
+        self.mark_acted(seat)
+
+    def level_complete(self):
+        # Everyone who can still act has acted since the last bet or raise
+        return self.num_acted == self.num_actors
+
+    def next_actor(self, seat):
+        # First seat at or after seat (wrapping around) that can act, or None
+        mask = self.actors
+        if not mask:
+            return None
+        ahead = mask >> seat << seat
+        return _lowest_seat(ahead or mask)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules live at the repository root; the game module opens a window on import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
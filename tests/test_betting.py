@@ -0,0 +1,83 @@
+import deepseek_python_20250602_dd902d as game
+from rng_backends import SeededRandom
+
+
+def _start_hand(stacks, script):
+    # Blinds posted with the button on seat 0; bots play the scripted (action, amount) list
+    table = game.TexasHoldemGame([(f"P{i}", chips) for i, chips in enumerate(stacks)],
+                                 rng=SeededRandom(1), sim_rng=SeededRandom(2))
+    for p in table.players:
+        p.is_human = False
+        p.reset_for_hand()
+    table.deck = game.Deck(table.rng)
+    table._rotate_dealer()
+    assert table._post_blinds()
+    table._deal_hole_cards()
+    table.seats.start_hand(table.players)
+    table.player_stats.start_hand(table.players)
+
+    order = []
+
+    def scripted_action(player):
+        order.append(player.name)
+        return script.pop(0)
+    table._get_bot_action = scripted_action
+    return table, order
+
+
+def _chips_conserved(table, stacks):
+    return sum(p.chips for p in table.players) + table.pot == sum(stacks)
+
+
+def test_limpers_leave_the_big_blind_an_option():
+    stacks = [1000, 1000, 1000]
+    table, order = _start_hand(stacks, [("call", 75), ("call", 25), ("check", 0)])
+    table._betting_round("Pre-flop")
+    assert order == ["P0", "P1", "P2"]
+    assert [p.current_bet_in_street for p in table.players] == [75, 75, 75]
+    assert _chips_conserved(table, stacks)
+
+
+def test_big_blind_raise_reopens_the_action():
+    stacks = [1000, 1000, 1000]
+    script = [("call", 75), ("call", 25), ("raise", 150), ("call", 150), ("fold", 0)]
+    table, order = _start_hand(stacks, script)
+    table._betting_round("Pre-flop")
+    assert order == ["P0", "P1", "P2", "P0", "P1"]
+    assert table.players[1].is_folded
+    assert table.pot == 225 + 150 + 150
+    assert _chips_conserved(table, stacks)
+
+
+def test_postflop_action_starts_left_of_button_and_skips_folded():
+    stacks = [1000, 1000, 1000]
+    script = [("fold", 0), ("call", 25), ("check", 0), ("check", 0), ("check", 0)]
+    table, order = _start_hand(stacks, script)
+    table._betting_round("Pre-flop")
+    table._betting_round("Flop")
+    assert order == ["P0", "P1", "P2", "P1", "P2"]
+    assert not script
+    assert _chips_conserved(table, stacks)
+
+
+def test_lone_player_must_answer_an_all_in():
+    stacks = [1000, 1000]
+    table, order = _start_hand(stacks, [("allin", 1000), ("call", 950)])
+    table._betting_round("Pre-flop")
+    assert order == ["P0", "P1"]
+    assert all(p.is_all_in for p in table.players)
+    assert table.pot == 2000
+    assert _chips_conserved(table, stacks)
+
+
+def test_lone_player_who_already_matched_is_not_asked_again():
+    # P2's short all-in from the big blind doesn't reopen the betting for P1
+    stacks = [200, 1000, 100]
+    table, order = _start_hand(stacks, [("allin", 200), ("call", 150), ("allin", 25)])
+    table._betting_round("Pre-flop")
+    assert order == ["P0", "P1", "P2"]
+    assert table.pot == 500
+    # With nobody left to bet against, later streets are dealt without asking P1
+    table._betting_round("Flop")
+    assert order == ["P0", "P1", "P2"]
+    assert _chips_conserved(table, stacks)
@@ -0,0 +1,39 @@
+from pot_ledger import PotLedger
+
+
+def _ledger(contributions):
+    ledger = PotLedger()
+    for player, amount in contributions.items():
+        ledger.add(player, amount)
+    return ledger
+
+
+def test_short_all_in_wins_only_the_main_pot():
+    ledger = _ledger({"A": 100, "B": 300, "C": 300})
+    payouts, pots = ledger.resolve({"A": 3, "B": 2, "C": 1}, {"A": 0, "B": 1, "C": 2})
+    assert payouts == {"A": 300, "B": 400}
+    assert pots == [(300, ["A"]), (400, ["B"])]
+
+
+def test_side_pot_goes_to_best_hand_that_covered_it():
+    ledger = _ledger({"A": 100, "B": 300, "C": 300})
+    payouts, pots = ledger.resolve({"A": 1, "B": 2, "C": 3}, {"A": 0, "B": 1, "C": 2})
+    assert payouts == {"C": 700}
+    assert pots == [(700, ["C"])]
+
+
+def test_tied_split_gives_odd_chip_left_of_button():
+    # C folded after posting 1, leaving an odd pot for the tied A and B
+    ledger = _ledger({"A": 50, "B": 50, "C": 1})
+    payouts, pots = ledger.resolve({"A": 5, "B": 5}, {"B": 0, "A": 1})
+    assert payouts == {"B": 51, "A": 50}
+    assert pots == [(101, ["B", "A"])]
+
+
+def test_folded_overcontribution_carries_down_to_live_players():
+    # A folded after putting in more than either live player
+    ledger = _ledger({"A": 500, "B": 200, "C": 300})
+    payouts, pots = ledger.resolve({"B": 2, "C": 1}, {"A": 0, "B": 1, "C": 2})
+    assert payouts == {"B": 600, "C": 400}
+    assert sum(payouts.values()) == ledger.total()
+    assert pots == [(600, ["B"]), (400, ["C"])]
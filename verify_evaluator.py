@@ -0,0 +1,179 @@
+# Exhaustive evaluator verification and throughput benchmark.
+#
+# Walks every 7-card hand (133,784,560 of them) through the evaluator under
+# test, sharded by the two lowest cards across a process pool, and checks the
+# category totals against the known counts. Every 5-card hand is also
+# compared key-for-key with the reference HandEvaluator._evaluate_5_card_hand
+# logic, and a random sample of 7-card hands with its best-of-21 result.
+#
+#     python verify_evaluator.py                      # everything, all cores
+#     python verify_evaluator.py --evaluator my_eval:MyEvaluator --workers 16
+#     python verify_evaluator.py --skip-seven --reference-sample 100000
+#
+# Evaluators only need an evaluate_ids(card_ids) -> strength key method.
+
+import argparse
+import importlib
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+from poker_core import (
+    HAND_RANK_NAMES, KEY_CATEGORY_SHIFT, NUM_CARDS, card_str, key_category, pack_key,
+)
+from hand_evaluator import HandEvaluator
+import shared_tables
+
+SEVEN_CARD_CATEGORY_COUNTS = [
+    23294460, 58627800, 31433400, 6461620, 6180020,
+    4047644, 3473184, 224848, 37260, 4324,
+]
+FIVE_CARD_CATEGORY_COUNTS = [
+    1302540, 1098240, 123552, 54912, 10200,
+    5108, 3744, 624, 36, 4,
+]
+MAX_REPORTED_MISMATCHES = 10
+SAMPLE_CHUNK = 5000
+
+RefCard = namedtuple("RefCard", "rank suit")
+REF_CARDS = [RefCard(c >> 2, c & 3) for c in range(NUM_CARDS)]
+
+_evaluator = None
+_reference = None
+
+
+def load_evaluator(path):
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def _init_worker(evaluator_path, tables_name):
+    global _evaluator, _reference
+    if tables_name:
+        shared_tables.init_worker(tables_name)
+    _evaluator = load_evaluator(evaluator_path)
+    _reference = HandEvaluator()
+
+
+def _reference_key(ids):
+    best = -1
+    for combo in itertools.combinations(ids, 5):
+        rank_code, tie_breakers, _ = _reference._evaluate_5_card_hand([REF_CARDS[c] for c in combo])
+        best = max(best, pack_key(rank_code, tie_breakers))
+    return best
+
+
+def _seven_card_shard(prefix):
+    start = time.perf_counter()
+    evaluate_ids = _evaluator.evaluate_ids
+    counts = [0] * 10
+    for rest in itertools.combinations(range(prefix[1] + 1, NUM_CARDS), 5):
+        counts[evaluate_ids(prefix + rest) >> KEY_CATEGORY_SHIFT] += 1
+    return counts, [], time.perf_counter() - start
+
+
+def _five_card_shard(first):
+    start = time.perf_counter()
+    counts = [0] * 10
+    mismatches = []
+    for rest in itertools.combinations(range(first + 1, NUM_CARDS), 4):
+        hand = (first,) + rest
+        key = _evaluator.evaluate_ids(hand)
+        counts[key_category(key)] += 1
+        expected = _reference_key(hand)
+        if key != expected and len(mismatches) < MAX_REPORTED_MISMATCHES:
+            mismatches.append((hand, key, expected))
+    return counts, mismatches, time.perf_counter() - start
+
+
+def _sample_shard(seed):
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    counts = [0] * 10
+    mismatches = []
+    for _ in range(SAMPLE_CHUNK):
+        hand = rng.sample(range(NUM_CARDS), 7)
+        key = _evaluator.evaluate_ids(hand)
+        counts[key_category(key)] += 1
+        expected = _reference_key(hand)
+        if key != expected and len(mismatches) < MAX_REPORTED_MISMATCHES:
+            mismatches.append((hand, key, expected))
+    return counts, mismatches, time.perf_counter() - start
+
+
+def _run(pool, title, fn, shards):
+    start = time.perf_counter()
+    counts = [0] * 10
+    mismatches = []
+    busy = 0.0
+    for shard_counts, shard_mismatches, shard_seconds in pool.imap_unordered(fn, shards):
+        counts = [a + b for a, b in zip(counts, shard_counts)]
+        mismatches += shard_mismatches
+        busy += shard_seconds
+    wall = time.perf_counter() - start
+    total = sum(counts)
+    print(f"\n{title}: {total:,} hands in {wall:.1f}s "
+          f"({total / wall:,.0f} hands/s, {total / busy if busy else 0:,.0f} hands/s per core)")
+    return counts, mismatches[:MAX_REPORTED_MISMATCHES]
+
+
+def _report(counts, expected_counts, mismatches):
+    ok = True
+    if expected_counts is not None:
+        for category in range(9, -1, -1):
+            flag = "ok" if counts[category] == expected_counts[category] else "MISMATCH"
+            ok &= flag == "ok"
+            print(f"  {HAND_RANK_NAMES[category]:<16}{counts[category]:>12,}{expected_counts[category]:>12,}  {flag}")
+    for hand, key, expected in mismatches:
+        ok = False
+        print(f"  {' '.join(card_str(c) for c in hand)}: got {key:#x}, reference {expected:#x}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify and benchmark a hand evaluator exhaustively")
+    parser.add_argument("--evaluator", default="fast_eval:FastEvaluator",
+                        help="module:Class of the evaluator under test")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--reference-sample", type=int, default=50000,
+                        help="random 7-card hands to check against the reference (0 to skip)")
+    parser.add_argument("--skip-five", action="store_true")
+    parser.add_argument("--skip-seven", action="store_true")
+    parser.add_argument("--shared-tables", action="store_true",
+                        help="publish lookup tables once and attach them in every worker")
+    args = parser.parse_args(argv)
+
+    tables = shared_tables.SharedTables.publish() if args.shared_tables else None
+    ok = True
+    try:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker,
+                                  initargs=(args.evaluator, tables.name if tables else None)) as pool:
+            print(f"Verifying {args.evaluator} on {args.workers} workers")
+            if not args.skip_five:
+                counts, mismatches = _run(pool, "5-card hands vs reference", _five_card_shard,
+                                          range(NUM_CARDS - 4))
+                ok &= _report(counts, FIVE_CARD_CATEGORY_COUNTS, mismatches)
+            if args.reference_sample > 0:
+                num_chunks = -(-args.reference_sample // SAMPLE_CHUNK)
+                counts, mismatches = _run(pool, "Sampled 7-card hands vs reference", _sample_shard,
+                                          range(num_chunks))
+                ok &= _report(counts, None, mismatches)
+            if not args.skip_seven:
+                # Largest shards first so the pool drains evenly
+                prefixes = sorted(itertools.combinations(range(NUM_CARDS - 5), 2), key=lambda p: p[1])
+                counts, mismatches = _run(pool, "All 7-card hands", _seven_card_shard, prefixes)
+                ok &= _report(counts, SEVEN_CARD_CATEGORY_COUNTS, mismatches)
+    finally:
+        if tables:
+            tables.unlink()
+
+    print("\nAll checks passed" if ok else "\nVerification FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())